@@ -0,0 +1,33 @@
+import time
+
+import numpy as np
+
+from nodepy import _beggs_brill as BB
+
+if __name__ == "__main__":
+
+    # a VLP family: 60 traverse steps x 20 rates
+    P,oil_rate = np.meshgrid(np.linspace(150.,1500.,60),np.linspace(50.,2000.,20),indexing="ij")
+
+    T = 100.+50.*(P-150.)/1350.
+
+    args = (P,T,oil_rate,0.5*oil_rate,375.,0.65,30.,1.07,2.44,90.)
+
+    states = zip(*(np.ravel(arg) for arg in np.broadcast_arrays(*args)))
+
+    start = time.perf_counter()
+    scalar = np.array([BB.Pgrad(*state) for state in states])
+    scalar_time = time.perf_counter()-start
+
+    repeat = 20
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vector = BB.Pgrad_array(*args)
+    vector_time = (time.perf_counter()-start)/repeat
+
+    print(f"states: {P.size}")
+    print(f"scalar Pgrad loop : {scalar_time*1e3:9.3f} ms")
+    print(f"Pgrad_array call  : {vector_time*1e3:9.3f} ms")
+    print(f"speedup           : {scalar_time/vector_time:9.1f} x")
+    print(f"max rel. diff     : {np.max(np.abs(vector.ravel()/scalar-1)):9.2e}")
@@ -0,0 +1,34 @@
+import time
+
+import numpy as np
+
+from nodepy.pressure_drop._darcy_weisbach import DarcyWeisbach
+
+def throughput(func,Re,epd,repeat=3):
+	"""Returns the best solves/second out of repeated runs and the last result."""
+	best = np.inf
+
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fD = func(Re,epd)
+		best = min(best,time.perf_counter()-start)
+
+	return Re.size/best,fD
+
+if __name__ == "__main__":
+
+	rng = np.random.default_rng(0)
+
+	print(f"{'size':>9} {'newton (solves/s)':>18} {'colebrook (solves/s)':>21} {'speedup':>8} {'max rel. diff':>14}")
+
+	for size in (10**3,10**4,10**5,10**6):
+
+		Re = 10**rng.uniform(np.log10(4000),8,size)
+		epd = 10**rng.uniform(-6,-1.5,size)
+
+		fast,fD_fast = throughput(DarcyWeisbach.colebrook_newton,Re,epd)
+		slow,fD_slow = throughput(DarcyWeisbach.colebrook,Re,epd,repeat=1)
+
+		error = np.max(np.abs(fD_fast-fD_slow)/fD_slow)
+
+		print(f"{size:>9} {fast:>18.3e} {slow:>21.3e} {fast/slow:>8.1f} {error:>14.2e}")
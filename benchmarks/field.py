@@ -0,0 +1,41 @@
+import os
+import time
+
+import numpy as np
+
+from nodepy import _field
+
+def wells(n:int,seed:int=0):
+    """Returns n random oil well definitions."""
+    rng = np.random.default_rng(seed)
+
+    table = np.zeros(n,dtype=_field.WELL_DTYPE)
+
+    for name,value in dict(Pb=2000.,FWHP=150.,FWHT=100.,GOR=375.,GasGrav=0.65,API=30.,WaterGrav=1.07,Angle=90.,FBHT=180.).items():
+        table[name] = value
+
+    table["Pres"] = rng.uniform(2500.,4500.,n)
+    table["J"] = rng.uniform(0.5,3.,n)
+    table["Wcut"] = rng.uniform(0.,0.6,n)
+    table["ID"] = rng.choice([1.995,2.441,2.992],n)
+    table["Depth"] = rng.uniform(4000.,9000.,n)
+
+    return table
+
+if __name__ == "__main__":
+
+    table = wells(256)
+
+    print(f"{'workers':>8} {'wells':>6} {'time [s]':>9} {'speedup':>8} {'ok':>5} {'failed':>7}")
+
+    serial = None
+
+    for workers in sorted({1,2,4,os.cpu_count() or 1}):
+
+        start = time.perf_counter()
+        results,errors = _field.field(table,max_workers=workers)
+        elapsed = time.perf_counter()-start
+
+        serial = serial or elapsed
+
+        print(f"{workers:>8} {table.size:>6} {elapsed:>9.2f} {serial/elapsed:>8.2f} {np.sum(results['status']==_field.OK):>5} {len(errors):>7}")
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+
+from nodepy import _beggs_brill as BB
+from nodepy._flow_pattern import FlowPatternMap, beggs_brill_regime
+
+if __name__ == "__main__":
+
+    # superficial velocities spanning the Beggs-Brill regimes of a 2.44 in. tubing
+    rng = np.random.default_rng(0)
+
+    usl = 10**rng.uniform(-2.,1.,1_000_000)
+    usg = 10**rng.uniform(-2.,2.,1_000_000)
+
+    start = time.perf_counter()
+    fpm = FlowPatternMap(2.44)
+    build_time = time.perf_counter()-start
+
+    repeat = 5
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        exact = beggs_brill_regime(usl,usg,2.44)
+    exact_time = (time.perf_counter()-start)/repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        looked = fpm(usl,usg)
+    lookup_time = (time.perf_counter()-start)/repeat
+
+    # the regimes as a share of a gradient call of the same number of states
+    P,oil_rate = np.meshgrid(np.linspace(150.,3000.,1000),np.linspace(20.,8000.,1000))
+
+    start = time.perf_counter()
+    BB.Pgrad_array(P,150.,oil_rate,0.5*oil_rate,375.,0.65,30.,1.07,2.44,90.)
+    pgrad_time = time.perf_counter()-start
+
+    print(f"queries            : {usl.size}")
+    print(f"raster build       : {build_time*1e3:9.3f} ms")
+    print(f"coverage           : {fpm.coverage:9.3f}")
+    print(f"regime function    : {exact_time*1e3:9.3f} ms")
+    print(f"raster lookup      : {lookup_time*1e3:9.3f} ms")
+    print(f"speedup            : {exact_time/lookup_time:9.1f} x")
+    print(f"Pgrad_array call   : {pgrad_time*1e3:9.3f} ms")
+    print(f"mismatches         : {np.count_nonzero(looked!=exact):9d}")
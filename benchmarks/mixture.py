@@ -0,0 +1,36 @@
+import time
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Mixture, Pipe
+
+def timed(func,repeat):
+	"""Returns the mean run time of func over repeat calls, s."""
+	start = time.perf_counter()
+	for _ in range(repeat):
+		result = func()
+	return (time.perf_counter()-start)/repeat, result
+
+if __name__ == "__main__":
+
+	mixture = Mixture(Pipe(4,100,1e-4),Fluid(0.02,rho=50.),Fluid(1.,rho=900.))
+
+	print(f"{'states':>8} {'get [ms]':>10} {'evaluate [ms]':>14} {'out= [ms]':>10} {'speedup':>8} {'max rel. diff':>14}")
+
+	for n in (10,1_000,100_000,1_000_000):
+
+		grate,lrate = np.logspace(-4,0,n),np.linspace(1e-4,0.05,n)
+
+		repeat = max(1,100_000//n)
+
+		get_time,head = timed(lambda: mixture.get(grate,lrate,1.2,method="colebrook_newton"),repeat)
+
+		new_time,_ = timed(lambda: mixture.evaluate(grate,lrate,1.2),repeat)
+
+		out = mixture.evaluate(grate,lrate,1.2)
+
+		out_time,out = timed(lambda: mixture.evaluate(grate,lrate,1.2,out=out),repeat)
+
+		print(f"{n:>8} {get_time*1e3:>10.3f} {new_time*1e3:>14.3f} {out_time*1e3:>10.3f} {get_time/out_time:>8.1f} {np.nanmax(np.abs(out.head/head-1)):>14.2e}")
@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import PipeArray, DarcyWeisbach, HazenWilliams
+from nodepy.network import Network
+
+def grid(n:int,model:type,seed:int=0,**options):
+	"""Returns an n x n grid network fed from one corner with uniform junction demands."""
+	rng = np.random.default_rng(seed)
+
+	network = Network()
+
+	for i in range(n):
+		for j in range(n):
+			if i==0 and j==0:
+				network.add_node((i,j),head=100.)
+			else:
+				network.add_node((i,j),demand=1e-4)
+
+	sources,targets = [],[]
+
+	for i in range(n):
+		for j in range(n):
+			if i<n-1:
+				sources.append((i,j)); targets.append((i+1,j))
+			if j<n-1:
+				sources.append((i,j)); targets.append((i,j+1))
+
+	size = len(sources)
+
+	pipes = PipeArray(
+		rng.uniform(4.,8.,size),
+		rng.uniform(100.,500.,size),
+		rng.uniform(1e-5,1e-3,size),
+		)
+
+	network.add_edges(sources,targets,model(pipes,Fluid(1.,1000.)),**options)
+
+	return network
+
+if __name__ == "__main__":
+
+	print(f"{'model':>14} {'edges':>8} {'solver':>7} {'iters':>6} {'s/iter':>9} {'us/edge/iter':>13} {'max |r2|':>10}")
+
+	for model,options in ((DarcyWeisbach,dict(method="colebrook_newton")),(HazenWilliams,{})):
+
+		for n in (16,32,64,128,224):
+
+			network = grid(n,model,**options)
+
+			for linsolve in ("direct","cg"):
+
+				start = time.perf_counter()
+				solver = network.solve(linsolve=linsolve,tol=1e-8)
+				elapsed = time.perf_counter()-start
+
+				residual = np.max(np.abs(solver.A21@solver.flows+solver.demand))
+
+				per_iter = elapsed/solver.niter
+
+				print(f"{model.__name__:>14} {len(network):>8} {linsolve:>7} {solver.niter:>6} {per_iter:>9.4f} {per_iter/len(network)*1e6:>13.3f} {residual:>10.2e}")
@@ -0,0 +1,37 @@
+import time
+
+import numpy as np
+
+from nodepy import _beggs_brill as BB
+from nodepy._pvt import PVTTable
+
+if __name__ == "__main__":
+
+    start = time.perf_counter()
+    pvt = PVTTable(0.65,30.,1.07,375.)
+    print(f"table build       : {(time.perf_counter()-start)*1e3:9.3f} ms")
+
+    rng = np.random.default_rng(0)
+
+    P,T,oil_rate = rng.uniform(100.,4000.,(3,1_000_000))*np.array([[1.],[0.04],[0.5]])+np.array([[0.],[80.],[20.]])
+
+    args = (P,T,oil_rate,0.5*oil_rate,375.,0.65,30.,1.07,2.44,90.)
+
+    start = time.perf_counter()
+    live = pvt.sample(P,T)
+    print(f"live properties   : {(time.perf_counter()-start)*1e3:9.3f} ms")
+
+    start = time.perf_counter()
+    pvt.props(P,T)
+    print(f"table properties  : {(time.perf_counter()-start)*1e3:9.3f} ms")
+
+    start = time.perf_counter()
+    exact = BB.Pgrad_array(*args)
+    print(f"live Pgrad_array  : {(time.perf_counter()-start)*1e3:9.3f} ms")
+
+    start = time.perf_counter()
+    tabled = BB.Pgrad_array(*args,pvt=pvt)
+    print(f"table Pgrad_array : {(time.perf_counter()-start)*1e3:9.3f} ms")
+
+    error = np.abs(tabled/exact-1)
+    print(f"rel. diff 99.9 %  : {np.nanpercentile(error,99.9):9.2e}")
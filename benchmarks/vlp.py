@@ -0,0 +1,26 @@
+import time
+
+import numpy as np
+
+from nodepy import _hagedorn_brown as HB
+from nodepy._traverse import vlp
+
+if __name__ == "__main__":
+
+    well = (0.65,30.,1.07,2.44,90.,5000.,180.)
+
+    print(f"{'rates':>6} {'loop [ms]':>10} {'vlp [ms]':>10} {'speedup':>8} {'max |dP| [psi]':>15}")
+
+    for n in (20,100,500):
+
+        rates = np.linspace(50.,2000.,n)
+
+        start = time.perf_counter()
+        looped = np.array([HB.Pwf_q(150.,100.,rate,0.5*rate,375.,*well) for rate in rates])
+        loop_time = time.perf_counter()-start
+
+        start = time.perf_counter()
+        _,press,_ = vlp(HB.Pgrad_array,150.,100.,rates,0.5*rates,375.,*well)
+        vlp_time = time.perf_counter()-start
+
+        print(f"{n:>6} {loop_time*1e3:>10.1f} {vlp_time*1e3:>10.1f} {loop_time/vlp_time:>8.1f} {np.max(np.abs(press[:,-1]-looped)):>15.2e}")
@@ -1,5 +1,13 @@
 """ Class Exercise 2 """
 
+import numpy as np
+
+from scipy import optimize
+
+from respy import Fluid
+
+from nodepy.pressure_drop import Compressible, Pipe
+
 Pg = 101325         # pressure in Pa
 Tg = 288            # Kelvin
 Mg = 0.016          # mole mass in kg/mole
@@ -21,15 +29,14 @@ rhog = (Pg*Mg)/(Rc*Tg)
 
 G = Qg*rhog         # kilogram per seconds
 
-A = np.pi*D**2/4
+flow = Compressible(Pipe(D/0.0254,L/0.3048),Fluid(mu*1e3),temperature=Tamb,molarweight=Mg)
 
-Re = (G*D)/(mu*A)
+# the Reynolds number, and so the friction factor, does not change along the pipe
+fD = flow.friction_mass(G)
 
-phi = optimize.newton(objective1,8/Re,args=(Re,))
+# the upstream pressure that carries the mass flow to the downstream pressure
+P1 = optimize.brentq(lambda P1: flow.get(P2,P1,fD=fD)-G,P2,10*P2)
 
-P1 = optimize.minimize(objective2,P2,
-                       args=(P2,L,D,phi,Mg,Tamb,G),
-                       bounds=[(P2,None)],
-                       method='Powell').x[0]
+wc = flow.critical(fD*L/D)
 
-wc = optimize.minimize_scalar(objective3,args=(L,D,phi),bounds=(1e-5,1),method='bounded').x
+print("Upstream pressure is {} kPa, the flow chokes below {} kPa downstream".format(P1/1e3,wc*P1/1e3))
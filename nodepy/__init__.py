@@ -1,6 +1,9 @@
 from . import pressure_drop as drop
+from . import network
 
-from .pressure_drop import Pipe, DarcyWeisbach, HazenWilliams
+from .pressure_drop import Pipe, PipeArray, DarcyWeisbach, HazenWilliams
+
+from ._inflow import IPR, IPRArray
 
 from ._mixture import Mixture
 from ._lockhart_martinelli import LockhartMartinelli
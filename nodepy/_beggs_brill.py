@@ -2,9 +2,15 @@
 #import sys
 #sys.path.append('C:\Users\frank\PEG Commmunity\VLP\psapy')
 import psapy.FluidProps as FluidProps
+import functools
 import math
 
-def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle):
+import numpy as np
+
+from . import _fluid_props as FluidArrays
+from ._traverse import traverse
+
+def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle, pvt=None, full_output=False):
     """Function to Calculate the Flowing Pressure Gradient by the Method of Beggs and Brill"""
     #P          pressure, psia
     #T          temperature, °F
@@ -18,6 +24,8 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     #angle      angle of pipe inclination in degrees
     #               90° = vertical
     #               0°  = horizontal
+    #pvt        optional _pvt.PVTCache or _pvt.PVTTable supplying the fluid properties
+    #full_output also return the flow regime and the liquid holdup
     
     #Set constants
     pi = math.pi   #4 * math.atan(1)                                               #Define pi
@@ -27,24 +35,28 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     #Convert pipe angle from degrees to radians
     angle = angle * pi / 180
     
-    #Calculate fluid properties
-    Z = FluidProps.zfact((T + 460) / FluidProps.Tc(gas_grav), P / FluidProps.Pc(gas_grav))               #Gas compressibility factor
     Wor = wtr_rate / oil_rate                                           #Water-oil ratio, stb/stb
-    TDS = FluidProps.salinity(wtr_grav)                                            #Water salinity, wt% total dissolved solids
-    Pb = FluidProps.Pbub(T, Tsep, Psep, gas_grav, oil_grav, Gor)                   #Bubble point pressure, psia
-    Rso = FluidProps.sol_gor(T, P, Tsep, Psep, Pb, gas_grav, oil_grav)             #Solution gas-oil ratio, scf/stb
-    Rsw = FluidProps.sol_gwr(P, T, TDS)                                            #Solution gas_water ratio, scf/stb
-    Bo = FluidProps.oil_fvf(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)         #Oil formation volume factor, rb/stb
-    Bw = FluidProps.wtr_fvf(P, T, TDS)                                             #Water formation volume factor, rb/stb
-    Bg = FluidProps.gas_fvf(P, T, gas_grav)                                        #Gas formation volume factor, ft_/scf
-    muo = FluidProps.oil_visc(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)       #Oil viscosity, cp
-    muw = FluidProps.wtr_visc(P, T, TDS)                                           #Water viscosity, cp
-    mug = FluidProps.gvisc(P, T + 460, Z, gas_grav)                                #Gas viscosity, cp
-    rhoo = FluidProps.oil_dens(T, P, Tsep, Psep, Pb, Bo, Rso, gas_grav, oil_grav)  #Oil density, lb/ft_
-    rhow = 62.368 * wtr_grav / Bw                                                  #Water density, lb/ft_
-    rhog = 2.699 * gas_grav * P / (T + 460) / Z                                    #Gas density, lb/ft_
-    sigo = FluidProps.oil_tens(P, T, oil_grav)                                     #Gas-oil interfacial tension, dynes/cm
-    sigw = FluidProps.wtr_tens(P, T)                                               #Gas-water interfacial tension, dynes/cm
+
+    #Calculate fluid properties
+    if pvt is not None:
+        Z, Pb, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw = pvt.props(P, T, gas_grav, oil_grav, wtr_grav, Gor)
+    else:
+        Z = FluidProps.zfact((T + 460) / FluidProps.Tc(gas_grav), P / FluidProps.Pc(gas_grav))               #Gas compressibility factor
+        TDS = FluidProps.salinity(wtr_grav)                                            #Water salinity, wt% total dissolved solids
+        Pb = FluidProps.Pbub(T, Tsep, Psep, gas_grav, oil_grav, Gor)                   #Bubble point pressure, psia
+        Rso = FluidProps.sol_gor(T, P, Tsep, Psep, Pb, gas_grav, oil_grav)             #Solution gas-oil ratio, scf/stb
+        Rsw = FluidProps.sol_gwr(P, T, TDS)                                            #Solution gas_water ratio, scf/stb
+        Bo = FluidProps.oil_fvf(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)         #Oil formation volume factor, rb/stb
+        Bw = FluidProps.wtr_fvf(P, T, TDS)                                             #Water formation volume factor, rb/stb
+        Bg = FluidProps.gas_fvf(P, T, gas_grav)                                        #Gas formation volume factor, ft_/scf
+        muo = FluidProps.oil_visc(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)       #Oil viscosity, cp
+        muw = FluidProps.wtr_visc(P, T, TDS)                                           #Water viscosity, cp
+        mug = FluidProps.gvisc(P, T + 460, Z, gas_grav)                                #Gas viscosity, cp
+        rhoo = FluidProps.oil_dens(T, P, Tsep, Psep, Pb, Bo, Rso, gas_grav, oil_grav)  #Oil density, lb/ft_
+        rhow = 62.368 * wtr_grav / Bw                                                  #Water density, lb/ft_
+        rhog = 2.699 * gas_grav * P / (T + 460) / Z                                    #Gas density, lb/ft_
+        sigo = FluidProps.oil_tens(P, T, oil_grav)                                     #Gas-oil interfacial tension, dynes/cm
+        sigw = FluidProps.wtr_tens(P, T)                                               #Gas-water interfacial tension, dynes/cm
 
     #Volume fraction weighted liquid properties
     rhol = (Bw * Wor * rhow + Bo * rhoo) / (Bw * Wor + Bo)              #Liquid density
@@ -110,6 +122,9 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     Pgrad_pe = rhobar * math.sin(angle) / 144                                 #Potential energy pressure gradient, psi/ft
     Pgrad_f = 2 * ftp * rhom * um ** 2 / 32.17 / (d / 12) / 144           #Frictional pressure gradient, psi/ft
     Ek = um * usg * rhobar / 32.17 / P / 144                              #Kinetic energy factor
+    if full_output:
+        return (Pgrad_pe + Pgrad_f) / (1 - Ek), regime, yl
+
     return (Pgrad_pe + Pgrad_f) / (1 - Ek)                               #Overall pressure gradient, psi/ft
 
 def Flow_regime(Nfr, laml, L1, L2, L3, L4):
@@ -226,6 +241,164 @@ def Fric(Nre, eps):
     
     return (1 / Temp) ** 2
 
+def Pgrad_array(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle, pvt=None, full_output=False):
+    """Array-native Pgrad: the Flowing Pressure Gradient by the Method of Beggs and Brill
+    for NumPy arrays of states, with the same arguments and units as Pgrad.
+
+    All arguments broadcast against each other; the flow regime selection and the holdup
+    coefficients are evaluated as masks, so that a whole VLP family is a single call.
+    Unlike Pgrad, a free gas-oil ratio within rounding of zero gives no gas flowrate.
+
+    pvt is an optional _pvt.PVTCache or _pvt.PVTTable of the fluid whose properties replace the
+    live correlations. With full_output, the flow regimes of Flow_regime_array and the liquid
+    holdups are returned after the gradients."""
+    P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle = np.broadcast_arrays(
+        *(np.asarray(arg, dtype=float) for arg in (P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)))
+
+    #Set constants
+    Psep = 114.7                                                        #Separator pressure, psia
+    Tsep = 50                                                           #Separator temperature, °F
+
+    #Convert pipe angle from degrees to radians
+    angle = angle * np.pi / 180
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        Wor = wtr_rate / oil_rate
+
+        #Calculate fluid properties
+        if pvt is not None:
+            Z, Pb, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw = pvt.props(P, T, gas_grav, oil_grav, wtr_grav, Gor)
+        else:
+            Z = FluidArrays.zfact((T + 460) / FluidArrays.Tc(gas_grav), P / FluidArrays.Pc(gas_grav))
+            TDS = FluidArrays.salinity(wtr_grav)
+            Pb = FluidArrays.Pbub(T, Tsep, Psep, gas_grav, oil_grav, Gor)
+            Rso = FluidArrays.sol_gor(T, P, Tsep, Psep, Pb, gas_grav, oil_grav)
+            Rsw = FluidArrays.sol_gwr(P, T, TDS)
+            Bo = FluidArrays.oil_fvf(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)
+            Bw = FluidArrays.wtr_fvf(P, T, TDS)
+            Bg = FluidArrays.gas_fvf(P, T, gas_grav)
+            muo = FluidArrays.oil_visc(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)
+            muw = FluidArrays.wtr_visc(P, T, TDS)
+            mug = FluidArrays.gvisc(P, T + 460, Z, gas_grav)
+            rhoo = FluidArrays.oil_dens(T, P, Tsep, Psep, Pb, Bo, Rso, gas_grav, oil_grav)
+            rhow = 62.368 * wtr_grav / Bw
+            rhog = 2.699 * gas_grav * P / (T + 460) / Z
+            sigo = FluidArrays.oil_tens(P, T, oil_grav)
+            sigw = FluidArrays.wtr_tens(P, T)
+
+        #Volume fraction weighted liquid properties
+        rhol = (Bw * Wor * rhow + Bo * rhoo) / (Bw * Wor + Bo)
+        mul = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * muw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * muo
+        sigl = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * sigw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * sigo
+
+        #Calculate downhole fluid flowrates in ft_/s
+        qo = Bo * oil_rate / 15387
+        qw = Bw * Wor * oil_rate / 15387
+        ql = qo + qw
+        #Above the bubble point Rso equals Gor up to rounding, which is treated as no free gas
+        qg = np.where((Gor - Rso) <= 1e-9 * Gor, 0., Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400)
+
+        #Calculate fluid superficial velocities in ft/s
+        Axs = np.pi / 4 * (d / 12) ** 2
+        usl = ql / Axs
+        usg = qg / Axs
+        um = usl + usg
+
+        #Determine flow regime
+        Nfr = um ** 2 / (d / 12) / 32.174
+        Nvl = 1.938 * usl * (rhol / sigl) ** 0.25
+        laml = usl / um
+        lamg = 1 - laml
+        L1 = 316 * laml ** 0.302
+        L2 = 0.0009252 * laml ** -2.4684
+        L3 = 0.1 * laml ** -1.4516
+        L4 = 0.5 * laml ** -6.738
+
+        regime = Flow_regime_array(Nfr, laml, L1, L2, L3, L4)
+
+        #Calculate holdups
+        a = (L3 - Nfr) / (L3 - L2)
+        yl_seg = Liq_holdup_array(Nfr, Nvl, laml, angle, 1)
+        yl_int = Liq_holdup_array(Nfr, Nvl, laml, angle, 3)
+        yl_dis = Liq_holdup_array(Nfr, Nvl, laml, angle, 4)
+
+        yl = np.select(
+            [regime == 1, regime == 2, regime == 3, regime == 4],
+            [yl_seg, a * yl_seg + (1 - a) * yl_int, yl_int, yl_dis], np.nan)
+
+        yg = 1 - yl
+
+        #Calculate fluid mixture properties
+        rhom = rhol * laml + rhog * lamg
+        mum = mul * laml + mug * lamg
+        rhobar = rhol * yl + rhog * yg
+
+        #Calculate friction factor
+        Nre = 1488 * rhom * um * (d / 12) / mum
+        fn = Fric_array(Nre, 0.0006)
+        x = laml / yl ** 2
+        lnx = np.log(x)
+        s = np.where((x > 1) & (x < 1.2), np.log(2.2 * x - 1.2),
+            lnx / (-0.0523 + 3.182 * lnx - 0.8725 * lnx ** 2 + 0.01853 * lnx ** 4))
+
+        ftp = fn * np.exp(s)
+
+        #Calculate gradients
+        Pgrad_pe = rhobar * np.sin(angle) / 144
+        Pgrad_f = 2 * ftp * rhom * um ** 2 / 32.17 / (d / 12) / 144
+        Ek = um * usg * rhobar / 32.17 / P / 144
+
+    if full_output:
+        return ((Pgrad_pe + Pgrad_f) / (1 - Ek))[()], regime[()], yl[()]
+
+    return ((Pgrad_pe + Pgrad_f) / (1 - Ek))[()]
+
+def Flow_regime_array(Nfr, laml, L1, L2, L3, L4):
+    """Array-native Flow_regime returning 1, 2, 3 or 4 per element, and 0 where no regime applies.
+
+    As in Flow_regime, a later regime overrides an earlier one when both conditions hold."""
+    return np.select([
+        ((laml < 0.4) & (Nfr >= L1)) | ((laml >= 0.4) & (Nfr > L4)),
+        (((0.01 <= laml) & (laml < 0.4)) & ((L3 < Nfr) & (Nfr < L1))) | ((laml >= 0.4) & (L3 < Nfr) & (Nfr <= L4)),
+        (laml >= 0.01) & (L2 < Nfr) & (Nfr <= L3),
+        ((laml < 0.01) & (Nfr < L1)) | ((laml >= 0.01) & (Nfr < L2)),
+        ], [4, 3, 2, 1], 0)
+
+#Holdup constants a, b, c and the uphill d, e, f, g per regime (row 0 and 2 are unused)
+HOLDUP_UPHILL = np.array([
+    [np.nan] * 7,
+    [0.98, 0.4846, 0.0868, 0.011, -3.768, 3.539, -1.614],
+    [np.nan] * 7,
+    [0.845, 0.5351, 0.0173, 2.96, 0.305, -0.4473, 0.0978],
+    [1.065, 0.5824, 0.0609, 1, 0, 0, 0],
+    ])
+
+#Downhill d, e, f, g shared by all regimes
+HOLDUP_DOWNHILL = np.array([4.7, -0.3692, 0.1244, -0.5056])
+
+def Liq_holdup_array(Nfr, Nvl, laml, angle, regime):
+    """Array-native Liq_holdup where regime is an integer or an array of 1, 3 and 4"""
+    a, b, c, d, e, f, g = np.moveaxis(HOLDUP_UPHILL[np.asarray(regime)], -1, 0)
+
+    downhill = np.asarray(angle) < 0
+
+    d, e, f, g = (np.where(downhill, down, up) for down, up in zip(HOLDUP_DOWNHILL, (d, e, f, g)))
+
+    corr = (1 - laml) * np.log(d * laml ** e * Nvl ** f * Nfr ** g)
+    corr = np.where(corr < 0, 0, corr)
+
+    psi = 1 + corr * (np.sin(1.8 * angle) - (np.sin(1.8 * angle)) ** 3 / 3)
+    ylo = a * laml ** b / Nfr ** c
+    ylo = np.where(ylo < laml, laml, ylo)
+
+    return ylo * psi
+
+def Fric_array(Nre, eps):
+    """Array-native Fric: Fanning Friction Factor using the Chen Equation"""
+    Temp = -4 * np.log10((eps / 3.7065) - (5.0452 / Nre) * np.log10((eps ** 1.1098 / 2.8257) + (7.149 / Nre) ** 0.8981))
+    return (1 / Temp) ** 2
+
 def Pgrad2(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle):
     """Function to Calculate the Flowing Pressure Gradient by the no slip method"""
     #P          pressure, psia
@@ -303,8 +476,15 @@ def Pgrad2(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle
     Pgrad_f = 2 * fn * rhom * um ** 2 / 32.17 / (d / 12)                 #Frictional pressure gradient, psi/ft
     return (Pgrad_pe + Pgrad_f) / 144                                 #Overall pressure gradient, psi/ft
 
-def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT):
-    """Function to calculate the Pwf as function of rate"""
+def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT, method="euler", pvt=None, **kwargs):
+    """Function to calculate the Pwf as function of rate
+
+    method="euler" marches 60 explicit Euler steps, method="rk45" integrates adaptively with
+    _traverse.traverse, which takes the step-size tolerances rtol and atol as keyword arguments;
+    pvt is an optional _pvt.PVTCache or _pvt.PVTTable passed on to Pgrad"""
+    if method == "rk45":
+        return traverse(functools.partial(Pgrad, pvt=pvt), FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, **kwargs).press[-1]
+
     DPs = []          ## Start as the empty list
     Temps=[]
     Press=[]
@@ -324,10 +504,10 @@ def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle,
         DeltaD= Depth/nSteps*i
         DepthList.append(DeltaD) 
     
-        T=Temps[i-1]+Tgrad*DeltaD
+        T=FWHT+Tgrad*DeltaD
         Temps.append(T)
         p=PressList[i-1]+DPs[i-1]*(DepthList[i]-DepthList[i-1])     
-        dp= Pgrad(p,T,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle)
+        dp= Pgrad(p,T,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, pvt=pvt)
         DPs.append(dp)
         
         PressList.append(p)
@@ -0,0 +1,15 @@
+import os
+
+def cachedir(*parts:str) -> str:
+    """Returns (and creates) the on-disk cache directory of nodepy.
+
+    The location is taken from the NODEPY_CACHE environment variable and
+    defaults to ~/.cache/nodepy; the optional parts are joined as sub-directories.
+    """
+    root = os.environ.get("NODEPY_CACHE") or os.path.join(os.path.expanduser("~"),".cache","nodepy")
+
+    path = os.path.join(root,*parts)
+
+    os.makedirs(path,exist_ok=True)
+
+    return path
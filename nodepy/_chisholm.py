@@ -35,8 +35,10 @@ class Chisholm(LockhartMartinelli):
         tdropG = phiG**2*dropG
         tdropL = phiL**2*dropL
 
-        if np.abs(tdropG-tdropL)/np.abs(tdropL)>1e-5:
-            logging.warning(f"Two-phase pressure drops calculated from liquid phase and gas phase are not the same: DP_G = {tdropG}, DP_L = {tdropL}")
+        mismatch = np.abs(tdropG-tdropL)/np.abs(tdropL)>1e-5
+
+        if np.any(mismatch):
+            logging.warning(f"Two-phase pressure drops calculated from liquid phase and gas phase are not the same for {np.count_nonzero(mismatch)} rate pairs: DP_G = {tdropG[mismatch]}, DP_L = {tdropL[mismatch]}")
 
         return tdropG
 
@@ -46,18 +48,13 @@ class Chisholm(LockhartMartinelli):
         return np.sqrt(dropL/dropG)
 
     @staticmethod
-    def get_C(lamG:bool,turbG:bool,lamL:bool,turbL:bool):
-        """Returns C constant based on Chisholm method."""
-        if lamL and lamG:
-            return 5.
-        elif turbL and lamG:
-            return 10.
-        elif lamL and turbG:
-            return 12.
-        elif turbL and turbG:
-            return 20
-
-        raise "Transition zone observed"
+    def get_C(lamG:np.ndarray,turbG:np.ndarray,lamL:np.ndarray,turbL:np.ndarray):
+        """Returns C constant based on Chisholm method, element-wise for the regime flags of the
+        phases; it is NaN where a phase is in the transition zone."""
+        return np.select(
+            [lamL&lamG,turbL&lamG,lamL&turbG,turbL&turbG],
+            [5.,10.,12.,20.],
+            np.nan)[()]
 
     @staticmethod
     def get_phiG(X,C):
@@ -0,0 +1,165 @@
+# coding=utf-8
+"""Field-wide nodal analysis of many wells on a pool of processes."""
+import concurrent.futures
+import functools
+import os
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import _beggs_brill
+from . import _hagedorn_brown
+from ._inflow import IPR, IPRArray
+from ._nodal import operating_points
+
+#Fields of a well definition: reservoir and inflow, then the arguments of Pwf_q
+WELL_DTYPE = np.dtype([
+    ("Pres", "f8"),         #average reservoir pressure, psia
+    ("J", "f8"),            #productivity index above the bubble point, stb/d/psi
+    ("Pb", "f8"),           #bubble point pressure, psia
+    ("Wcut", "f8"),         #water cut, fraction of the liquid rate
+    ("FWHP", "f8"),         #flowing wellhead pressure, psia
+    ("FWHT", "f8"),         #flowing wellhead temperature, °F
+    ("GOR", "f8"),          #producing gas-oil ratio, scf/stb
+    ("GasGrav", "f8"),      #gas specific gravity
+    ("API", "f8"),          #API oil gravity
+    ("WaterGrav", "f8"),    #water specific gravity
+    ("ID", "f8"),           #tubing I.D., in.
+    ("Angle", "f8"),        #inclination, degrees
+    ("Depth", "f8"),        #depth of the producing interval, ft
+    ("FBHT", "f8"),         #flowing bottomhole temperature, °F
+    ])
+
+#Fields of a result: the stable operating point, the Beggs-Brill regime at the bottom and a status
+RESULT_DTYPE = np.dtype([
+    ("rate", "f8"),         #oil rate, stb/d
+    ("pwf", "f8"),          #flowing bottomhole pressure, psia
+    ("regime", "i1"),       #Beggs-Brill flow regime at the bottomhole, 0 if undefined
+    ("status", "i1"),       #one of the STATUS codes
+    ])
+
+#Status codes of a result
+OK, NO_FLOW, FAILED, PENDING = 0, 1, 2, -1
+
+CORRELATIONS = {"beggs_brill": _beggs_brill, "hagedorn_brown": _hagedorn_brown}
+
+def nodal(well, correlation="beggs_brill", AOF=None, **kwargs):
+    """Function to calculate the stable operating point of a single well definition.
+
+    The tubing curve is the Pwf_q traverse of the correlation and the inflow curve is the
+    composite Darcy-Vogel IPR of _inflow.IPR.partial; when several stable points exist the
+    largest rate is taken. AOF is the absolute open flow of the well, calculated from the IPR
+    when None. The keyword arguments are passed to _nodal.operating_points.
+
+    Returns a RESULT_DTYPE record."""
+    Pwf_q = CORRELATIONS[correlation].Pwf_q
+
+    Pres, J, Pb, Wcut = (float(well[name]) for name in ("Pres", "J", "Pb", "Wcut"))
+
+    if not (Pres > 0 and J > 0 and Pb > 0 and 0 <= Wcut < 1):
+        raise ValueError(f"Invalid inflow data Pres={Pres}, J={J}, Pb={Pb}, Wcut={Wcut}.")
+
+    tubing = tuple(float(well[name]) for name in ("GOR", "GasGrav", "API", "WaterGrav", "ID", "Angle", "Depth", "FBHT"))
+
+    def vlp(rate):
+        return Pwf_q(float(well["FWHP"]), float(well["FWHT"]), rate, rate * Wcut / (1 - Wcut), *tubing)
+
+    inflow = functools.partial(IPR().partial, Pb, Pres, PI=J)
+
+    AOF = float(inflow(0.)) if AOF is None else float(AOF)
+
+    points = operating_points(lambda rate: float(inflow(rate=rate)), vlp, AOF * (1 - 1e-9), qmin=1e-3 * AOF, **kwargs)
+
+    stable = [point for point in points if point.stable]
+
+    result = np.zeros((), dtype=RESULT_DTYPE)
+
+    if not stable:
+        result["rate"], result["pwf"], result["status"] = 0., np.nan, NO_FLOW
+        return result
+
+    rate, pwf = stable[-1].rate, stable[-1].pwf
+
+    _, regime, _ = _beggs_brill.Pgrad_array(pwf, tubing[-1], rate, rate * Wcut / (1 - Wcut), *tubing[:6], full_output=True)
+
+    result["rate"], result["pwf"], result["regime"], result["status"] = rate, pwf, regime, OK
+
+    return result
+
+def _solve_chunk(name, size, indices, wells, correlation, kwargs):
+    """Solves a chunk of wells in a worker and writes the records into the shared result buffer.
+
+    Returns the (index, message) pairs of the wells that raised."""
+    memory = shared_memory.SharedMemory(name=name)
+
+    try:
+        results = np.ndarray(size, dtype=RESULT_DTYPE, buffer=memory.buf)
+
+        errors = []
+
+        #the open flows of the whole chunk in one call, one row per well
+        AOF = IPRArray().partial(wells["Pb"], wells["Pres"], 0., PI=wells["J"])[:, 0]
+
+        for index, well, aof in zip(indices, wells, AOF.tolist()):
+            try:
+                results[index] = nodal(well, correlation, aof, **kwargs)
+            except Exception as error:
+                results[index] = (np.nan, np.nan, 0, FAILED)
+                errors.append((int(index), f"{type(error).__name__}: {error}"))
+
+        del results
+
+    finally:
+        memory.close()
+
+    return errors
+
+def field(wells, correlation="beggs_brill", max_workers=None, chunksize=None, **kwargs):
+    """Function to run the nodal analysis of many wells on a process pool.
+
+    The wells are given as a structured array with the fields of WELL_DTYPE (or anything
+    indexable by these names, e.g. a dict of arrays). They are split into contiguous chunks
+    that are solved by a concurrent.futures.ProcessPoolExecutor; every worker writes its
+    records straight into a results array in shared memory at the rows of its wells, so the
+    order of the results is the order of the wells whatever the scheduling.
+
+    A well that raises does not stop the batch: its record gets status FAILED and the
+    message is collected. With max_workers=1 the wells are solved in this process.
+
+    max_workers number of processes (default is the number of CPUs)
+    chunksize   number of wells per task (default gives four tasks per process)
+
+    Returns the RESULT_DTYPE array and a dict of the error messages keyed by well index."""
+    wells = np.rec.fromarrays([np.asarray(wells[name], dtype=float) for name in WELL_DTYPE.names], dtype=WELL_DTYPE)
+
+    size = wells.size
+
+    max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+
+    chunksize = max(1, -(-size // (4 * max_workers))) if chunksize is None else chunksize
+
+    memory = shared_memory.SharedMemory(create=True, size=max(1, size * RESULT_DTYPE.itemsize))
+
+    try:
+        results = np.ndarray(size, dtype=RESULT_DTYPE, buffer=memory.buf)
+        results[:] = (np.nan, np.nan, 0, PENDING)
+
+        chunks = [(memory.name, size, np.arange(start, min(start + chunksize, size)), wells[start:start + chunksize], correlation, kwargs)
+            for start in range(0, size, chunksize)]
+
+        if max_workers == 1 or len(chunks) <= 1:
+            errors = [_solve_chunk(*chunk) for chunk in chunks]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+                errors = list(executor.map(_solve_chunk, *zip(*chunks)))
+
+        output = results.copy()
+
+        del results
+
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return output, dict(error for chunk in errors for error in chunk)
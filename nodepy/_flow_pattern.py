@@ -0,0 +1,131 @@
+# coding=utf-8
+"""Flow pattern maps: the regimes of the gradient correlations rasterized over superficial velocities."""
+import numpy as np
+
+from ._beggs_brill import Flow_regime_array
+
+def beggs_brill_regime(usl, usg, d):
+    """Function to calculate the Beggs-Brill flow regime of Flow_regime_array from the liquid and
+    gas superficial velocities, ft/s, in a pipe of I.D. d, in.; the arguments may be arrays"""
+    usl, usg = np.asarray(usl, dtype=float), np.asarray(usg, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        um = usl + usg
+
+        Nfr = um ** 2 / (d / 12) / 32.174
+        laml = usl / um
+        L1 = 316 * laml ** 0.302
+        L2 = 0.0009252 * laml ** -2.4684
+        L3 = 0.1 * laml ** -1.4516
+        L4 = 0.5 * laml ** -6.738
+
+        return Flow_regime_array(Nfr, laml, L1, L2, L3, L4)
+
+def griffith_regime(usl, usg, d):
+    """Function to calculate the Hagedorn-Brown flow regime, 1 for the Griffith bubble flow and 0
+    otherwise, from the liquid and gas superficial velocities, ft/s, in a pipe of I.D. d, in."""
+    usl, usg = np.asarray(usl, dtype=float), np.asarray(usg, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        um = usl + usg
+
+        A = np.maximum(1.071 - ((0.2218 * um ** 2) / (d)), 0.13)
+
+        return np.where(usg / (um) - A >= 0, 1, 0)
+
+#Regime functions of the correlations by name
+PATTERNS = {"beggs_brill": beggs_brill_regime, "hagedorn_brown": griffith_regime}
+
+class FlowPatternMap():
+    """Raster of the flow regimes of a correlation over a log-spaced grid of the liquid and gas
+    superficial velocities in a pipe.
+
+    Every cell holds the regime at its center in a uint8, whose high bit BOUNDARY flags the
+    cells that a regime boundary may cross: those where the center and the four corners do
+    not agree, and their neighbours. A query looks up the cell of every velocity pair in O(1);
+    the flagged cells and the pairs outside the grid fall back to the exact regime function,
+    so that the answer is always the one of the correlation.
+
+    The lookup is about twice as fast as the regime functions (benchmarks/flow_pattern.py).
+    The Pgrad_array functions still compute their regimes: Beggs-Brill needs the Froude number
+    and the L boundaries for its holdups anyway and the Griffith test is a single comparison,
+    so the regime selection is a small share of a gradient call.
+
+    Attributes:
+        d (float)           : Pipe I.D., in.
+        pattern (str)       : Name of the correlation in PATTERNS.
+        raster (np.ndarray) : The (n_usl, n_usg) uint8 regimes with the BOUNDARY flags.
+        usl (np.ndarray)    : Liquid superficial velocities of the cell edges, ft/s.
+        usg (np.ndarray)    : Gas superficial velocities of the cell edges, ft/s.
+    """
+    BOUNDARY = 0x80
+
+    def __init__(self, d, pattern="beggs_brill", usl=(1e-3, 1e2), usg=(1e-3, 1e3), shape=(512, 512)):
+        """Rasterizes the regimes of the pattern in the pipe of I.D. d, in., for the ranges of the
+        superficial velocities, ft/s, on a grid of the given number of cells."""
+        if pattern not in PATTERNS:
+            raise ValueError(f"Unknown pattern {pattern!r}, use one of {list(PATTERNS)}.")
+
+        self.d, self.pattern = float(d), pattern
+
+        self._regime = PATTERNS[pattern]
+
+        self.usl = np.geomspace(*usl, shape[0] + 1)
+        self.usg = np.geomspace(*usg, shape[1] + 1)
+
+        self._lower = np.log10([usl[0], usg[0]])
+        self._step = (np.log10([usl[1], usg[1]]) - self._lower) / shape
+
+        corners = self._regime(self.usl[:, None], self.usg[None, :], self.d)
+
+        centers = self._regime(np.sqrt(self.usl[:-1] * self.usl[1:])[:, None], np.sqrt(self.usg[:-1] * self.usg[1:])[None, :], self.d)
+
+        uneven = np.zeros(shape, dtype=bool)
+
+        for corner in (corners[:-1, :-1], corners[1:, :-1], corners[:-1, 1:], corners[1:, 1:]):
+            uneven |= corner != centers
+
+        #a boundary between two cell centers is caught on either side of it
+        flagged = uneven.copy()
+        flagged[1:] |= uneven[:-1]
+        flagged[:-1] |= uneven[1:]
+        flagged[:, 1:] |= uneven[:, :-1]
+        flagged[:, :-1] |= uneven[:, 1:]
+
+        self.raster = centers.astype(np.uint8) | np.where(flagged, self.BOUNDARY, 0).astype(np.uint8)
+
+    def __call__(self, usl, usg, d=None):
+        """Returns the regimes of the liquid and gas superficial velocities, ft/s, that broadcast
+        against each other, by raster lookup with the exact fallback.
+
+        The optional pipe I.D. d, in., as taken by the regime functions, must be the one of the
+        map; the regimes of another pipe raise ValueError instead of being looked up."""
+        if d is not None and not np.all(np.asarray(d) == self.d):
+            raise ValueError(f"The flow pattern map was built for the I.D. {self.d} in., not for {d}.")
+
+        usl, usg = np.broadcast_arrays(np.asarray(usl, dtype=float), np.asarray(usg, dtype=float))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            i = np.floor((np.log10(usl) - self._lower[0]) / self._step[0])
+            j = np.floor((np.log10(usg) - self._lower[1]) / self._step[1])
+
+        inside = (i >= 0) & (i < self.raster.shape[0]) & (j >= 0) & (j < self.raster.shape[1])
+
+        cells = np.full(usl.shape, self.BOUNDARY, dtype=np.uint8)
+        cells[inside] = self.raster[i[inside].astype(int), j[inside].astype(int)]
+
+        exact = (cells & self.BOUNDARY) != 0
+
+        regime = cells & ~np.uint8(self.BOUNDARY)
+
+        if np.any(exact):
+            regime[exact] = self._regime(usl[exact], usg[exact], self.d)
+
+        return regime[()]
+
+    @property
+    def coverage(self):
+        """Returns the fraction of the cells that are answered without the exact fallback."""
+        return 1 - np.count_nonzero(self.raster & self.BOUNDARY) / self.raster.size
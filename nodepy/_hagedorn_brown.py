@@ -1,7 +1,14 @@
-import FluidProps
+import psapy.FluidProps as FluidProps
+import functools
 import math
 
-def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle):
+import numpy as np
+
+from . import _fluid_props as FluidArrays
+from ._traverse import traverse
+from ._beggs_brill import Fric_array
+
+def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle, pvt=None, full_output=False):
     """Function to Calculate the Flowing Pressure Gradient by the Method of Beggs and Brill"""
     #P          pressure, psia
     #T          temperature, °F
@@ -15,9 +22,9 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     #angle      angle of pipe inclination in degrees
     #               90° = vertical
     #               0°  = horizontal
+    #pvt        optional _pvt.PVTCache or _pvt.PVTTable supplying the fluid properties
+    #full_output also return the flow regime (1 for the Griffith bubble flow, 0 otherwise) and the liquid holdup
 
-    print( 'P', P, ' T ', T, ' WOR ', oil_rate/wtr_rate, ' GOR ', Gor)
-    
     #Set constants
     pi = math.pi   #4 * math.atan(1)                                               #Define pi
     Psep = 114.7                                                        #Separator pressure, psia
@@ -26,28 +33,29 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     #Convert pipe angle from degrees to radians
     angle = angle * pi / 180
     
-    #Calculate fluid properties
-    Z = FluidProps.zfact((T + 460) / FluidProps.Tc(gas_grav), P / FluidProps.Pc(gas_grav))               #Gas compressibility factor
-    if T==145.0:
-        print ('error')
-       
     Wor = wtr_rate / oil_rate                                           #Water-oil ratio, stb/stb
-    TDS = FluidProps.salinity(wtr_grav)                                            #Water salinity, wt% total dissolved solids
-    Pb = FluidProps.Pbub(T, Tsep, Psep, gas_grav, oil_grav, Gor)                   #Bubble point pressure, psia
-    Rso = FluidProps.sol_gor(T, P, Tsep, Psep, Pb, gas_grav, oil_grav)             #Solution gas-oil ratio, scf/stb
-    Rsw = FluidProps.sol_gwr(P, T, TDS)                                            #Solution gas_water ratio, scf/stb
-    Bo = FluidProps.oil_fvf(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)         #Oil formation volume factor, rb/stb
-    Bw = FluidProps.wtr_fvf(P, T, TDS)                                             #Water formation volume factor, rb/stb
-    Bg = FluidProps.gas_fvf(P, T, gas_grav)                                        #Gas formation volume factor, ft_/scf
-    muo = FluidProps.oil_visc(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)       #Oil viscosity, cp
-    muw = FluidProps.wtr_visc(P, T, TDS)                                           #Water viscosity, cp
-    mug = FluidProps.gvisc(P, (T + 460), Z, gas_grav)                                #Gas viscosity, cp
-    rhoo = FluidProps.oil_dens(T, P, Tsep, Psep, Pb, Bo, Rso, gas_grav, oil_grav)  #Oil density, lb/ft_
-    rhow = 62.368 * wtr_grav / Bw                                                  #Water density, lb/ft_
-    rhog = 2.699 * gas_grav * P / (T + 460) / Z                                    #Gas density, lb/ft_
-    sigo = FluidProps.oil_tens(P, T, oil_grav)                                     #Gas-oil interfacial tension, dynes/cm
-    sigw = FluidProps.wtr_tens(P, T)                                               #Gas-water interfacial tension, dynes/cm
-   
+
+    #Calculate fluid properties
+    if pvt is not None:
+        Z, Pb, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw = pvt.props(P, T, gas_grav, oil_grav, wtr_grav, Gor)
+    else:
+        Z = FluidProps.zfact((T + 460) / FluidProps.Tc(gas_grav), P / FluidProps.Pc(gas_grav))               #Gas compressibility factor
+        TDS = FluidProps.salinity(wtr_grav)                                            #Water salinity, wt% total dissolved solids
+        Pb = FluidProps.Pbub(T, Tsep, Psep, gas_grav, oil_grav, Gor)                   #Bubble point pressure, psia
+        Rso = FluidProps.sol_gor(T, P, Tsep, Psep, Pb, gas_grav, oil_grav)             #Solution gas-oil ratio, scf/stb
+        Rsw = FluidProps.sol_gwr(P, T, TDS)                                            #Solution gas_water ratio, scf/stb
+        Bo = FluidProps.oil_fvf(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)         #Oil formation volume factor, rb/stb
+        Bw = FluidProps.wtr_fvf(P, T, TDS)                                             #Water formation volume factor, rb/stb
+        Bg = FluidProps.gas_fvf(P, T, gas_grav)                                        #Gas formation volume factor, ft_/scf
+        muo = FluidProps.oil_visc(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)       #Oil viscosity, cp
+        muw = FluidProps.wtr_visc(P, T, TDS)                                           #Water viscosity, cp
+        mug = FluidProps.gvisc(P, (T + 460), Z, gas_grav)                                #Gas viscosity, cp
+        rhoo = FluidProps.oil_dens(T, P, Tsep, Psep, Pb, Bo, Rso, gas_grav, oil_grav)  #Oil density, lb/ft_
+        rhow = 62.368 * wtr_grav / Bw                                                  #Water density, lb/ft_
+        rhog = 2.699 * gas_grav * P / (T + 460) / Z                                    #Gas density, lb/ft_
+        sigo = FluidProps.oil_tens(P, T, oil_grav)                                     #Gas-oil interfacial tension, dynes/cm
+        sigw = FluidProps.wtr_tens(P, T)                                               #Gas-water interfacial tension, dynes/cm
+
     #Volume fraction weighted liquid properties
     rhol = (Bw * Wor * rhow + Bo * rhoo) / (Bw * Wor + Bo)              #Liquid density
     mul = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * muw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * muo             #Liquid viscosity
@@ -76,8 +84,9 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     if A<0.13:
         A=0.13
     B= usg/(um)
+    griffith = B-A>=0
 
-    if B-A>=0:
+    if griffith:
         ## use Griffing Lquid holp up Correlation 
         us=0.8*0.3048
         x=(1+um/us)**2-4*usg/us
@@ -154,8 +163,136 @@ def Pgrad(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)
     Pgrad_pe = rhobar * math.sin(angle) / 144                                 #Potential energy pressure gradient, psi/ft
     Pgrad_f = 2 * ftp * rhom * um ** 2 / 32.17 / (d / 12) / 144           #Frictional pressure gradient, psi/ft
     Ek = um * usg * rhobar / 32.17 / P / 144                              #Kinetic energy factor
+    if full_output:
+        return (Pgrad_pe + Pgrad_f) / (1 - Ek), int(griffith), HL
+
     return (Pgrad_pe + Pgrad_f) / (1 - Ek)                               #Overall pressure gradient, psi/ft
 
+def Pgrad_array(P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle, pvt=None, full_output=False):
+    """Array-native Pgrad: the Flowing Pressure Gradient by the Method of Hagedorn and Brown
+    for NumPy arrays of states, with the same arguments and units as Pgrad.
+
+    All arguments broadcast against each other; the Griffith/Hagedorn-Brown holdup branch and
+    the piecewise PHI correlation are evaluated as masks, so that many rates are a single call.
+    Unlike Pgrad, a free gas-oil ratio within rounding of zero gives no gas flowrate.
+
+    pvt is an optional _pvt.PVTCache or _pvt.PVTTable of the fluid whose properties replace the
+    live correlations. With full_output, the flow regimes (1 for the Griffith bubble flow, 0
+    otherwise) and the liquid holdups are returned after the gradients."""
+    P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle = np.broadcast_arrays(
+        *(np.asarray(arg, dtype=float) for arg in (P, T, oil_rate, wtr_rate, Gor, gas_grav, oil_grav, wtr_grav, d, angle)))
+
+    #Set constants
+    Psep = 114.7                                                        #Separator pressure, psia
+    Tsep = 50                                                           #Separator temperature, °F
+
+    #Convert pipe angle from degrees to radians
+    angle = angle * np.pi / 180
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        Wor = wtr_rate / oil_rate
+
+        #Calculate fluid properties
+        if pvt is not None:
+            Z, Pb, Rso, Rsw, Bo, Bw, Bg, muo, muw, mug, rhoo, rhow, rhog, sigo, sigw = pvt.props(P, T, gas_grav, oil_grav, wtr_grav, Gor)
+        else:
+            Z = FluidArrays.zfact((T + 460) / FluidArrays.Tc(gas_grav), P / FluidArrays.Pc(gas_grav))
+            TDS = FluidArrays.salinity(wtr_grav)
+            Pb = FluidArrays.Pbub(T, Tsep, Psep, gas_grav, oil_grav, Gor)
+            Rso = FluidArrays.sol_gor(T, P, Tsep, Psep, Pb, gas_grav, oil_grav)
+            Rsw = FluidArrays.sol_gwr(P, T, TDS)
+            Bo = FluidArrays.oil_fvf(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)
+            Bw = FluidArrays.wtr_fvf(P, T, TDS)
+            Bg = FluidArrays.gas_fvf(P, T, gas_grav)
+            muo = FluidArrays.oil_visc(T, P, Tsep, Psep, Pb, Rso, gas_grav, oil_grav)
+            muw = FluidArrays.wtr_visc(P, T, TDS)
+            mug = FluidArrays.gvisc(P, (T + 460), Z, gas_grav)
+            rhoo = FluidArrays.oil_dens(T, P, Tsep, Psep, Pb, Bo, Rso, gas_grav, oil_grav)
+            rhow = 62.368 * wtr_grav / Bw
+            rhog = 2.699 * gas_grav * P / (T + 460) / Z
+            sigo = FluidArrays.oil_tens(P, T, oil_grav)
+            sigw = FluidArrays.wtr_tens(P, T)
+
+        #Volume fraction weighted liquid properties
+        rhol = (Bw * Wor * rhow + Bo * rhoo) / (Bw * Wor + Bo)
+        mul = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * muw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * muo
+        sigl = (Bw * Wor * rhow) / (Bw * Wor * rhow + Bo * rhoo) * sigw + (Bo * rhoo) / (Bw * Wor * rhow + Bo * rhoo) * sigo
+
+        #Calculate downhole fluid flowrates in ft_/s
+        qo = Bo * oil_rate / 15387
+        qw = Bw * Wor * oil_rate / 15387
+        ql = qo + qw
+        #Above the bubble point Rso equals Gor up to rounding, which is treated as no free gas
+        qg = np.where((Gor - Rso) <= 1e-9 * Gor, 0., Bg * (Gor - Rso - Rsw * Wor) * oil_rate / 86400)
+
+        #Calculate fluid superficial velocities in ft/s
+        Axs = np.pi / 4 * (d / 12) ** 2
+        usl = ql / Axs
+        usg = qg / Axs
+        um = usl + usg
+
+        #Determine flow regime: Griffith bubble flow where the gas fraction exceeds the limit A
+        A = np.maximum(1.071 - ((0.2218 * um ** 2) / (d)), 0.13)
+        griffith = usg / (um) - A >= 0
+
+        #Griffith liquid holdup correlation
+        us = 0.8 * 0.3048
+        x = (1 + um / us) ** 2 - 4 * usg / us
+        HL_griffith = 1 - 0.5 * (1 + um / us - np.sqrt(x))
+
+        #Hagedorn and Brown liquid holdup correlation
+        NL = 0.15726 * mul * (1 / (rhol * sigl ** 3)) ** 0.25
+        CNL = 0.061 * NL ** 3 - 0.0929 * NL ** 2 + 0.0505 * NL + 0.0019
+
+        NLv = 1.938 * usl * (rhol / (sigl)) ** 0.25
+        NGv = 1.938 * usg * (rhol / (sigl)) ** 0.25
+        ND = 120.872 * d / 12 * np.sqrt(rhol / (sigl))
+
+        H = np.where(NGv == 0, 0., NLv / (NGv ** 0.575) * (P / 14.7) ** 0.1 * CNL / ND)
+
+        H_Phi = np.sqrt((0.047 + (1123.32) * H + 729489.64 * H ** 2) / (1 + 1097.1556 * H + 722153.97 * H ** 2))
+
+        B = NGv * (NLv ** 0.38) / (ND ** 2.14)
+
+        PHI = np.select(
+            [B <= 0.025, B <= 0.055, B > 0.055],
+            [27170 * B ** 3 - 317.52 * B ** 2 + 0.5472 * B + 0.9999, -5333.33 * B ** 2 + 58.524 * B + 0.1171, 2.5714 * B + 1.5962],
+            np.nan)
+
+        HL = np.where(griffith, HL_griffith, H_Phi * PHI)
+
+        laml = usl / um
+        lamg = 1 - laml
+
+        yl = HL
+        yg = 1 - HL
+
+        #Calculate fluid mixture properties
+        rhom = rhol * laml + rhog * lamg
+        mum = mul ** yl * mug ** (yg)
+        rhobar = rhol * yl + rhog * yg
+
+        #Calculate friction factor
+        Nre = 1488 * rhom * um * (d / 12) / mum
+        fn = Fric_array(Nre, 0.0006)
+        x = laml / HL ** 2
+        lnx = np.log(x)
+        s = np.where((x > 1) & (x < 1.2), np.log(2.2 * x - 1.2),
+            lnx / (-0.0523 + 3.182 * lnx - 0.8725 * lnx ** 2 + 0.01853 * lnx ** 4))
+
+        ftp = fn * np.exp(s)
+
+        #Calculate gradients
+        Pgrad_pe = rhobar * np.sin(angle) / 144
+        Pgrad_f = 2 * ftp * rhom * um ** 2 / 32.17 / (d / 12) / 144
+        Ek = um * usg * rhobar / 32.17 / P / 144
+
+    if full_output:
+        return ((Pgrad_pe + Pgrad_f) / (1 - Ek))[()], griffith.astype(int)[()], HL[()]
+
+    return ((Pgrad_pe + Pgrad_f) / (1 - Ek))[()]
+
 def Fric(Nre, eps):
     """Calculate Fanning Friction Factor using the Chen Equation """
     try:
@@ -168,8 +305,15 @@ def Fric(Nre, eps):
     
     return (1 / Temp) ** 2
 
-def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT):
-    """Function to calculate the Pwf as function of rate"""
+def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, Depth, FBHT, method="euler", pvt=None, **kwargs):
+    """Function to calculate the Pwf as function of rate
+
+    method="euler" marches 60 explicit Euler steps, method="rk45" integrates adaptively with
+    _traverse.traverse, which takes the step-size tolerances rtol and atol as keyword arguments;
+    pvt is an optional _pvt.PVTCache or _pvt.PVTTable passed on to Pgrad"""
+    if method == "rk45":
+        return traverse(functools.partial(Pgrad, pvt=pvt), FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT, **kwargs).press[-1]
+
     DPs = []          ## Start as the empty list
     Temps=[]
     Press=[]
@@ -192,7 +336,7 @@ def Pwf_q(FWHP, FWHT,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle,
         T=FWHT+Tgrad*DeltaD
         Temps.append(T)
         p=PressList[i-1]+DPs[i-1]*(DepthList[i]-DepthList[i-1])     
-        dp= Pgrad(p,T,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle)
+        dp= Pgrad(p,T,Oil_Rate,Water_Rate,GOR,GasGrav,API, WaterGrav, ID, Angle, pvt=pvt)
         DPs.append(dp)
         
         PressList.append(p)
@@ -0,0 +1,264 @@
+# coding=utf-8
+"""Inflow performance relationships: the reservoir side of the nodal analysis of a well."""
+import numpy
+
+class IPR():
+    """
+    Inflow performance relationships of a radial well in oil field units.
+
+    The reservoir properties and the pressure arguments of the methods may be NumPy arrays;
+    all curves are evaluated with broadcasting and masks, without Python loops.
+    """
+
+    def __init__(self,**kwargs):
+        """oil field units"""
+        self.re     = kwargs.get("re")
+        self.height = kwargs.get("height")
+
+        self.poro   = kwargs.get("poro")
+        self.perm   = kwargs.get("perm")
+
+        self.Bo     = kwargs.get("Bo")
+        self.muo    = kwargs.get("muo")
+
+        self.ct     = kwargs.get("ct")
+
+        self.rw     = kwargs.get("rw")
+        self.skin   = kwargs.get("skin")
+
+    @staticmethod
+    def well(value):
+        """Returns a well-wise argument in the shape that broadcasts against the pressures."""
+        return value
+
+    def PI(self,regime="pseudo",**kwargs):
+
+        return getattr(self,f"PI_{regime}")(**kwargs)
+
+    def PI_transient(self,time=1):
+        """time in days"""
+
+        upper = (self.perm*self.height)
+
+        term = self.perm/(self.poro*self.muo*self.ct*self.rw**2)
+
+        lower = 162.6*self.Bo*self.muo*(numpy.log10(term*time*24)-3.23+0.87*self.skin)
+
+        return upper/lower
+
+    def PI_steady(self):
+
+        upper = (self.perm*self.height)
+
+        lower = 141.2*self.Bo*self.muo*(numpy.log(self.re/self.rw)+self.skin)
+
+        return upper/lower
+
+    def PI_pseudo(self):
+
+        upper = (self.perm*self.height)
+
+        lower = 141.2*self.Bo*self.muo*(numpy.log(self.re/self.rw)-0.75+self.skin)
+
+        return upper/lower
+
+    def undersaturated(self,pres,rate=None,pwf=None,regime="pseudo",**kwargs):
+
+        if kwargs.get("PI") is None:
+            PI = getattr(self,f"PI_{regime}")(**kwargs)
+        else:
+            PI = self.well(kwargs.get("PI"))
+
+        pres = self.well(pres)
+
+        if rate is None:
+            return PI*(pres-pwf)
+
+        return pres-rate/PI
+
+    def vogel(self,PI,pres,rate=None,pwf=None):
+
+        PI,pres = self.well(PI),self.well(pres)
+
+        qmax = PI*pres/1.8
+
+        if rate is None:
+            return qmax*(1-0.2*(pwf/pres)-0.8*(pwf/pres)**2)
+
+        values = 81-80*(rate/qmax)
+
+        with numpy.errstate(invalid="ignore"):
+            return numpy.where(values<0,numpy.nan,0.125*pres*(numpy.sqrt(values)-1))
+
+    def fetkovich(self,PI,pres,rate=None,pwf=None,n=None):
+
+        PI,pres,n = self.well(PI),self.well(pres),self.well(n)
+
+        qmax = PI*pres/1.8
+
+        with numpy.errstate(invalid="ignore"):
+
+            if rate is None:
+                return qmax*(1-(pwf/pres)**2)**n
+
+            values = 1-(rate/qmax)**(1/n)
+
+            return numpy.where(values<0,numpy.nan,pres*numpy.sqrt(values))
+
+    def saturated(self,pres,rate=None,pwf=None,model="vogel",n=None,regime="pseudo",**kwargs):
+
+        if kwargs.get("PI") is None:
+            PI = getattr(self,f"PI_{regime}")(**kwargs)
+        else:
+            PI = kwargs.get("PI")
+
+        if model == "vogel":
+            return self.vogel(PI,pres,rate,pwf)
+        elif model == "fetkovich":
+            return self.fetkovich(PI,pres,rate,pwf,n)
+
+    def partial(self,pb,pres,pwf=None,model="vogel",n=None,regime="pseudo",rate=None,**kwargs):
+        """Returns the rates of the composite IPR, straight above pb and saturated below it, at
+        the flowing pressures; given the rates instead, returns their flowing pressures, NaN
+        above the absolute open flow. A bubble point above pres is taken at pres."""
+        if kwargs.get("PI") is None:
+            PI = getattr(self,f"PI_{regime}")(**kwargs)
+        else:
+            PI = self.well(kwargs.get("PI"))
+
+        pb = numpy.minimum(self.well(pb),self.well(pres))
+
+        if rate is not None:
+
+            rate = numpy.asarray(rate,dtype=float)
+
+            qb = self.undersaturated(pres,None,pb,PI=PI)
+
+            above = self.undersaturated(pres,rate,PI=PI)
+
+            if model == "vogel":
+                below = self.vogel(PI,pb,rate-qb)
+            elif model == "fetkovich":
+                below = self.fetkovich(PI,pb,rate-qb,None,n)
+
+            pwf = numpy.where(rate<=qb,above,below)
+
+            return numpy.where(rate<0,numpy.nan,pwf)
+
+        pwf = numpy.asarray(pwf,dtype=float)
+
+        above = self.undersaturated(pres,None,pwf,PI=PI)
+
+        below = self.undersaturated(pres,None,pb,PI=PI)
+
+        if model == "vogel":
+            below = below+self.vogel(PI,pb,None,pwf)
+        elif model == "fetkovich":
+            below = below+self.fetkovich(PI,pb,None,pwf,n)
+
+        rate = numpy.where(pwf>pb,above,below)
+
+        return numpy.where(pwf<0,numpy.nan,rate)
+
+    def curve(self,pres,pb=None,nPoints=20,model="vogel",n=None,regime="pseudo",**kwargs):
+        """Returns the rates and the flowing bottomhole pressures of the IPR curve on nPoints
+        equal pressure steps from pres down to zero, the partial model if pb is given."""
+        pres = self.well(pres)
+
+        pwf = pres*(1-numpy.arange(nPoints+1)/nPoints)
+
+        if pb is None:
+            return self.undersaturated(pres,None,pwf,regime,**kwargs),pwf
+
+        return self.partial(pb,pres,pwf,model,n,regime,**kwargs),pwf
+
+    def PI_vogel(self,pb,pres,rate1:float,pwf1:float):
+
+        pb,pres,rate1,pwf1 = (self.well(value) for value in (pb,pres,rate1,pwf1))
+
+        dp1 = numpy.where(pwf1>pb,pres-pwf1,(pres-pb)+self.vogel(1,pb,None,pwf1))
+
+        return rate1/dp1
+
+    def PI_fetkovich(self,pb,pres,rate1:float,rate2:float,pwf1:float,pwf2:float):
+
+        pb,pres,rate1,rate2,pwf1,pwf2 = (self.well(value) for value in (pb,pres,rate1,rate2,pwf1,pwf2))
+
+        upper = numpy.log10(rate1/rate2)
+        lower = numpy.log10((pres**2-pwf1**2)/(pres**2-pwf2**2))
+
+        n = upper/lower
+
+        dp1 = (pres-pb)+self.fetkovich(1,pb,None,pwf1,n)
+
+        return rate1/dp1,n
+
+class IPRArray(IPR):
+    """
+    Array-backed IPR of many wells.
+
+    The reservoir properties and the well-wise method arguments (pres, pb, PI, n, ...) are
+    stored as (n_wells, 1) columns, so that a row of pressures or rates gives the
+    (n_wells, n_points) matrix of every well in one call. A (n_wells, n_points) matrix of
+    pressures, e.g. from curve, is evaluated element-wise.
+    """
+
+    def __init__(self,**kwargs):
+        """oil field units, one value (or a value shared by all wells) per property"""
+        super().__init__(**{key:self.well(value) for key,value in kwargs.items()})
+
+    @staticmethod
+    def well(value):
+        """Returns a well-wise argument as a (n_wells, 1) column."""
+        if value is None:
+            return None
+
+        value = numpy.asarray(value,dtype=float)
+
+        return value if value.ndim==2 else value.reshape((-1,1))
+
+def _points(P,nPoints):
+    """Returns the flowing pressures on nPoints equal steps from P down to zero."""
+    return numpy.asarray(P,dtype=float)[...,None]*(1-numpy.arange(nPoints+1)/nPoints)
+
+def _vogel(J,P,Pb,Pwfs):
+    """Returns the rates of the straight-line IPR above Pb and of Vogel's equation below it."""
+    Qb = J*(P-Pb)
+
+    return numpy.where(Pwfs>=Pb,J*(P-Pwfs),Qb+(J*Pb/1.8)*(1-0.2*(Pwfs/Pb)-0.8*(Pwfs/Pb)**2))
+
+def Darcy_IPR(k,h,visc, re,rw, s, P, OilFVF, nPoints):
+    """Function to calculate IPR using Darcy's Equation.  It returns a list with a pair of Pressure and rates
+
+    The arguments may be arrays of wells, in which case the rates and pressures have one row per well."""
+    k,h,visc,re,rw,s,P,OilFVF = (numpy.asarray(value,dtype=float)[...,None] for value in (k,h,visc,re,rw,s,P,OilFVF))
+
+    Pwf = _points(P[...,0],nPoints)
+
+    Q = (k*h/visc)*(P-Pwf)/(141.2*OilFVF*visc*(numpy.log(re/rw)-0.75+s))
+
+    return [Q,Pwf]
+
+def VogelIPR(P, Pb, Pwf, Qo, nPoints):
+    """Function to calculate IPR using Vogel's Equation.  It returns a list with a pair of Pressure and rates
+
+    The arguments may be arrays of wells, in which case the rates and pressures have one row per well."""
+    P,Pb,Pwf,Qo = (numpy.asarray(value,dtype=float)[...,None] for value in (P,Pb,Pwf,Qo))
+
+    J = numpy.where(Pwf>=Pb,Qo/(P-Pwf),Qo/((P-Pb)+((Pb/1.8)*(1-0.2*(Pwf/Pb)-0.8*(Pwf/Pb)**2))))
+
+    Pwfs = _points(P[...,0],nPoints)
+
+    return [_vogel(J,P,Pb,Pwfs),Pwfs]
+
+def Vogel_DarcyIPR(P, k,h,visc, re,rw, s, OilFVF,Temp, Pb, nPoints):
+    """Function to calculate IPR using Vogel's Equation.  It returns a list with a pair of Pressure and rates
+
+    The arguments may be arrays of wells, in which case the rates and pressures have one row per well."""
+    P,k,h,visc,re,rw,s,OilFVF,Pb = (numpy.asarray(value,dtype=float)[...,None] for value in (P,k,h,visc,re,rw,s,OilFVF,Pb))
+
+    J= (k*h/visc)/(141.2*OilFVF*visc*(numpy.log(re/rw)-0.75+s))
+
+    Pwfs = _points(P[...,0],nPoints)
+
+    return [_vogel(J,P,Pb,Pwfs),Pwfs]
@@ -1,3 +1,5 @@
+import numpy as np
+
 from respy import Fluid
 
 from .pressure_drop._pipe import Pipe
@@ -35,23 +37,65 @@ class LockhartMartinelli():
         """Setter for the superficial liquid model."""
         self._liq = DarcyWeisbach(self.pipe,value)
 
-    def get(self,grate,lrate,gdict:dict=None,ldict:dict=None):
-        pass
+    #Flow patterns with a multiplier curve, in the order of their integer codes
+    PATTERNS = ("dispersed_bubbly","elongated_bubbly","smooth_stratified","stratified_wavy","slug_flow","annular_mist")
+
+    def get(self,grate,lrate,pattern="dispersed_bubbly",gdict:dict=None,ldict:dict=None):
+        """Returns the two-phase pressure drop of the gas and liquid rates.
+
+        The rates broadcast against each other; pattern is a name of PATTERNS, or an array of
+        names or integer codes with one flow pattern per rate pair, whose curve gives the
+        multiplier of the superficial liquid drop at the Lockhart-Martinelli parameter."""
+        dropG = self.gas.get(grate,**(gdict or {}))
+        dropL = self.liq.get(lrate,**(ldict or {}))
+
+        X = np.sqrt(dropL/dropG)
+
+        return self.multiplier(X,pattern)*dropL
+
+    @classmethod
+    def multiplier(cls,X,pattern="dispersed_bubbly"):
+        """Returns the multiplier curves of the flow patterns at the Lockhart-Martinelli parameters X.
+
+        Every pattern curve is evaluated once on the elements of its pattern; unknown codes give NaN.
+        The quadratic curves in ln(X) are positive for all X, the slug_flow line only for
+        X > exp(-2.2/6.5) = 0.713; a multiplier that is not positive gives NaN."""
+        X = np.asarray(X,dtype=float)
+
+        pattern = np.asarray(pattern)
+
+        if pattern.dtype.kind in "US":
+            codes = np.full(pattern.shape,-1)
+            for code,name in enumerate(cls.PATTERNS):
+                codes[pattern==name] = code
+        else:
+            codes = pattern.astype(int)
+
+        X,codes = np.broadcast_arrays(X,codes)
+
+        values = np.full(X.shape,np.nan)
+
+        for code,name in enumerate(cls.PATTERNS):
+
+            mask = codes==code
+
+            if np.any(mask):
+                values[mask] = getattr(cls,name)(X[mask])
+
+        values[values<=0] = np.nan
+
+        return values[()]
 
     @staticmethod
-    def regime(lamG:bool,turbG:bool,lamL:bool,turbL:bool):
-        """Returns flow regime for both phases"""
-        if lamL and lamG:
-            return True,True
-        elif lamL and turbG:
-            return True,False
-        elif turbL and lamG:
-            return False,True
-        elif turbL and turbG:
-            return False,False
-
-        raise "Transition zone observed"
-    
+    def regime(lamG:np.ndarray,turbG:np.ndarray,lamL:np.ndarray,turbL:np.ndarray):
+        """Returns flow regime for both phases as the laminar flags of the liquid and the gas;
+        the elements with a phase in the transition zone are flagged in a third array."""
+        lamG,turbG,lamL,turbL = np.broadcast_arrays(lamG,turbG,lamL,turbL)
+
+        transition = ~((lamG|turbG)&(lamL|turbL))
+
+        return lamL&~transition,lamG&~transition,transition
+
     @staticmethod
     def dispersed_bubbly(x):
         return 4-12*np.log(x)+28*(np.log(x))**2
@@ -1,8 +1,16 @@
+import collections
+
+import numpy as np
+
 from respy import Fluid
 
 from .pressure_drop._pipe import Pipe
 from .pressure_drop._darcy_weisbach import DarcyWeisbach
 
+#Results of the array path of Mixture, in SI units: the mass and volume qualities of gas, the
+#mixture density, kg/m3, viscosity, Pa.s, and volumetric flow rate, m3/s, and the head loss
+MixtureArrays = collections.namedtuple("MixtureArrays","quality voidage rho visc rate head")
+
 class Mixture():
 
 	def __init__(self,pipe:Pipe,gas:Fluid,liq:Fluid):
@@ -12,6 +20,10 @@ class Mixture():
 		self.gas = gas
 		self.liq = liq
 
+		#Reynolds numbers, friction factors and regime masks of evaluate, reused while the shape
+		#does not change
+		self._scratch = None
+
 	def get(self,grate,lrate,slip:float=1.,**kwargs):
 		"""Calculates the head loss due to friction using the selected model."""
 		fluid = self.fluid(grate,lrate,slip)
@@ -19,6 +31,86 @@ class Mixture():
 
 		return model.get(fluid._rate,**kwargs)
 
+	def evaluate(self,grate,lrate,slip:float=1.,method:str="colebrook_newton",out:MixtureArrays=None,**kwargs):
+		"""Calculates the mixture properties and the homogeneous head loss of gas and liquid rate
+		arrays without constructing any Fluid or DarcyWeisbach objects.
+
+		The rates and the slip broadcast against each other (and against the pipes of a
+		PipeArray). All results are written into the contiguous arrays of a MixtureArrays, which
+		also serve as the scratch space of the calculation; passing the MixtureArrays of a
+		previous call as out reuses them across the iterations of a solver. The Reynolds numbers,
+		friction factors and regime masks are kept in buffers of the instance, and the Colebrook
+		equation of colebrook_newton is solved in place in them. The head loss equals the one of get with
+		the same friction method, which is given to DarcyWeisbach by name.
+
+		Returns the MixtureArrays out."""
+		grate,lrate,slip = (np.asarray(value,dtype=float) for value in (grate,lrate,slip))
+
+		shape = np.broadcast_shapes(grate.shape,lrate.shape,slip.shape,np.shape(self.pipe.diam))
+
+		if out is None:
+			out = MixtureArrays(*(np.empty(shape) for _ in MixtureArrays._fields))
+		elif not isinstance(out,MixtureArrays) or any(value.shape!=shape for value in out):
+			raise ValueError(f"The out argument must be the MixtureArrays of a call with the shape {shape}.")
+
+		if self._scratch is None or self._scratch[0].shape!=shape:
+			self._scratch = (np.empty(shape),np.empty(shape),np.empty(shape,dtype=bool),np.empty(shape,dtype=bool))
+
+		Re,fD,laminar,transition = self._scratch
+
+		x,a,rho,mu,Q,head = out
+
+		#gas and liquid mass rates are held in head and Q, their sum in mu until they are needed
+		np.multiply(grate,self.gas._rho,out=head)
+		np.multiply(lrate,self.liq._rho,out=Q)
+		np.add(head,Q,out=mu)
+		np.divide(head,mu,out=x)
+
+		np.multiply(slip,lrate,out=a)
+		np.add(a,grate,out=a)
+		np.divide(grate,a,out=a)
+
+		np.multiply(a,self.gas._rho-self.liq._rho,out=rho)
+		np.add(rho,self.liq._rho,out=rho)
+
+		np.divide(mu,rho,out=Q)
+
+		np.multiply(x,self.gas._visc-self.liq._visc,out=mu)
+		np.add(mu,self.liq._visc,out=mu)
+
+		#Reynolds number of DarcyWeisbach.reynolds, held in head
+		np.multiply(rho,Q,out=head)
+		np.multiply(head,4/(np.pi*self.pipe.diam),out=head)
+		np.divide(head,mu,out=head)
+
+		np.less(head,DarcyWeisbach.LOWER_REYNOLDS_LIMIT,out=laminar)
+		np.less_equal(head,DarcyWeisbach.UPPER_REYNOLDS_LIMIT,out=transition)
+		np.logical_xor(transition,laminar,out=transition)
+
+		if method=="colebrook_newton":
+			#solved for all elements at turbulent Reynolds numbers, the laminar and transition
+			#ones are overwritten below
+			np.maximum(head,DarcyWeisbach.UPPER_REYNOLDS_LIMIT,out=Re)
+			DarcyWeisbach.colebrook_newton(Re,self.pipe.epd,out=fD,**kwargs)
+		else:
+			fD.fill(np.nan)
+
+			turbulent = head>DarcyWeisbach.UPPER_REYNOLDS_LIMIT
+
+			if np.any(turbulent):
+				fD[turbulent] = getattr(DarcyWeisbach,method)(head[turbulent],np.broadcast_to(self.pipe.epd,shape)[turbulent],**kwargs)
+
+		np.copyto(fD,np.nan,where=transition)
+		np.divide(64,head,out=fD,where=laminar)
+
+		#head loss of DarcyWeisbach._head
+		np.divide(Q,self.pipe.csa,out=head)
+		np.square(head,out=head)
+		np.multiply(head,fD,out=head)
+		np.multiply(head,self.pipe.length/(2*9.80665*self.pipe.diam),out=head)
+
+		return out
+
 	def fluid(self,grate,lrate,slip:float=1.):
 		"""Returns mixture fluid with density, viscosity, quality, voidage, and flow rate properties."""
 		gmass = grate*self.gas._rho
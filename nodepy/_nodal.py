@@ -0,0 +1,60 @@
+# coding=utf-8
+"""Nodal analysis: operating points at the intersections of the inflow and outflow curves."""
+import collections
+
+import numpy as np
+
+from scipy.optimize import brentq
+
+OperatingPoint = collections.namedtuple("OperatingPoint", "rate pwf stable")
+
+def operating_points(ipr, vlp, qmax, qmin=0., nGrid=16, xtol=1e-6, rtol=1e-10, full_output=False):
+    """Function to find all operating points of a well, the rates where the flowing bottomhole
+    pressure available from the reservoir equals the one required by the tubing.
+
+    The residual ipr(q) - vlp(q) is sampled on a coarse grid of nGrid intervals between qmin
+    and qmax; every sign change brackets an intersection that is refined with Brent's method.
+    An intersection is stable when the residual falls through zero, i.e. when the tubing
+    curve crosses the inflow curve from below, and unstable otherwise. Intersections closer
+    together than the grid spacing may be missed, so nGrid should resolve the VLP minimum.
+
+    ipr     callable returning the bottomhole pressure of the reservoir at a rate, psia
+    vlp     callable returning the bottomhole pressure required by the tubing at a rate, psia,
+            e.g. a partial of _beggs_brill.Pwf_q over the rate
+    qmax    largest rate of the search, usually the absolute open flow
+
+    Returns a list of OperatingPoint(rate, pwf, stable) sorted by rate; with full_output
+    also the number of residual evaluations, each one call of ipr and of vlp."""
+    nfev = [0]
+
+    def residual(q):
+        nfev[0] += 1
+        return ipr(q) - vlp(q)
+
+    rates = np.linspace(qmin, qmax, nGrid + 1)
+    values = np.array([residual(q) for q in rates])
+
+    points = []
+
+    for i in range(nGrid):
+
+        q0, q1 = rates[i], rates[i + 1]
+        r0, r1 = values[i], values[i + 1]
+
+        if r0 == 0:
+            rate = q0
+        elif r0 * r1 < 0:
+            rate = brentq(residual, q0, q1, xtol=xtol, rtol=rtol)
+        else:
+            continue
+
+        #the slope of the bracket classifies a root on the grid by its right neighbour
+        points.append(OperatingPoint(rate, ipr(rate), bool(r1 < 0)))
+
+    if values[-1] == 0:
+        points.append(OperatingPoint(qmax, ipr(qmax), bool(values[-2] > 0)))
+
+    if full_output:
+        return points, nfev[0]
+
+    return points
@@ -1,12 +1,10 @@
-import math
-import FluidProps
+import psapy.FluidProps as FluidProps
 import matplotlib.pyplot as plt
-from scipy import interpolate
 import numpy as np
-import Vogel
-import BeggsandBrill as BB
-from scipy.optimize import fsolve
-import Hagendornandbrown as HB
+from nodepy import _hagedorn_brown as HB
+from nodepy._traverse import vlp
+from nodepy._nodal import operating_points
+from nodepy._inflow import Vogel_DarcyIPR
 
 Oil_Rate=100
 Water_Rate=50.0
@@ -35,25 +33,12 @@ visc= 1.55
 Psat = FluidProps.Pbub(Temp,75.0,100.0,GasGrav, API, GOR)
 Wcut= Water_Rate/(Oil_Rate+Water_Rate)
 
-def Press_Function(rateArray, pressArray, x):
-        return np.interp(x,rateArray, pressArray)
+IPR=Vogel_DarcyIPR(Pressure,k,Thickness, visc,re,rw,s, 1.21, Temp, Psat, 20)
 
-IPR=Vogel.Vogel_DarcyIPR(Pressure,k,Thickness, visc,re,rw,s, 1.21, Temp, Psat, 20)
-
-BB_Pwf=[]
-BB_Rate=[]
-for i in IPR[0]:
-    if i==0:
-        rate=0.1
-    else:
-        rate=i  
-    wr=rate*Wcut/(1-Wcut)   
-    #print 'req rate '   ,rate
-    Pf=HB.Pwf_q(FWHP,FWHT,rate, wr,GOR,GasGrav,API,WaterGrav,ID,Angle, Depth, FBHT)
-    BB_Pwf.append(Pf)
-    BB_Rate.append(rate)
-    #print Pf
-#print "PWF " + str(Pf)
+BB_Rate=np.where(np.asarray(IPR[0])==0,0.1,IPR[0])
+#all rates are marched down the well together, one vectorized gradient call per step
+_,VLP_Press,_=vlp(HB.Pgrad_array,FWHP,FWHT,BB_Rate,BB_Rate*Wcut/(1-Wcut),GOR,GasGrav,API,WaterGrav,ID,Angle,Depth,FBHT)
+BB_Pwf=VLP_Press[:,-1]
 
 x= np.asarray(BB_Rate)
 f= np.asarray(IPR[1])
@@ -61,28 +46,18 @@ g= np.asarray(BB_Pwf)
 
 q=x
 
-QNew =np.linspace(0.1, BB_Rate[-1],10000)
-P_IPR=np.interp(QNew, x, f)
-P_VLP=np.interp(QNew, x, g)
-
-SolRate= [fsolve(lambda x:Press_Function(QNew,P_IPR,x)-Press_Function(QNew,P_VLP,x), 0.0)]
-print0(SolRate)
-
-plt.plot(QNew, P_IPR )
-plt.plot(QNew, P_VLP )
-
-#def findIntersection(fun1, fun2, x0):
-    #return fsolve(lambda x:fun1[x]-fun2[x], x0)
-
-#t= findIntersection(P_IPR,P_VLP,0.0)
+def VLP_Pwf(rate):
+        #the pressures of the last depth, for a scalar rate or an array of rates
+        return vlp(HB.Pgrad_array,FWHP,FWHT,rate,rate*Wcut/(1-Wcut),GOR,GasGrav,API,WaterGrav,ID,Angle,Depth,FBHT)[1][...,-1]
 
-#print t
+#every intersection bracketed on a coarse grid and refined with Brent's method
+Points=operating_points(lambda rate:np.interp(rate,x,f),VLP_Pwf,BB_Rate[-1],qmin=0.1)
+print(Points)
 
-idx = np.argwhere(np.diff(np.sign(P_IPR - P_VLP)) != 0.0).reshape(-1) + 0
 plt.plot(IPR[0], IPR[1])
 plt.plot(BB_Rate, BB_Pwf )
 
-plt.plot(QNew[idx], P_IPR[idx], 'ro', ms=10)
+plt.plot([p.rate for p in Points], [p.pwf for p in Points], 'ro', ms=10)
 
 plt.ylabel('Pwf')
 plt.xlabel('Rate')
@@ -0,0 +1,227 @@
+# coding=utf-8
+"""Sensitivity sweeps of the operating point over Cartesian grids of well parameters."""
+import hashlib
+import os
+
+import numpy as np
+
+from ._cache import cachedir
+from ._field import CORRELATIONS, WELL_DTYPE
+from ._inflow import IPR
+from ._traverse import vlp
+
+#Fields of a sweep cell: the largest stable operating point, NaN where the well does not flow
+SWEEP_DTYPE = np.dtype([("rate", "f8"), ("pwf", "f8")])
+
+class LabeledArray():
+    """N-D NumPy array with named dimensions and coordinate labels, a small subset of xarray.DataArray.
+
+    Attributes:
+        values (np.ndarray) : The data; a structured array gives one LabeledArray per field name.
+        dims (tuple)        : Names of the dimensions.
+        coords (dict)       : Labels of every dimension.
+    """
+
+    def __init__(self, values, dims, coords):
+        """Initializes the array from the data, the dimension names and the labels of every dimension."""
+        self.values = np.asarray(values)
+        self.dims = tuple(dims)
+        self.coords = {dim: np.asarray(coords[dim]) for dim in self.dims}
+
+        if self.values.shape != tuple(self.coords[dim].size for dim in self.dims):
+            raise ValueError("The shape of the values does not match the coordinates.")
+
+    @property
+    def shape(self):
+        """Getter for the shape of the values."""
+        return self.values.shape
+
+    def __getitem__(self, key):
+        """Returns the field of a structured array as a LabeledArray, otherwise indexes the values."""
+        if isinstance(key, str):
+            return LabeledArray(self.values[key], self.dims, self.coords)
+
+        return self.values[key]
+
+    def isel(self, **indices):
+        """Selects by position along the named dimensions; an integer drops the dimension."""
+        values, dims, coords = self.values, [], {}
+
+        for axis, dim in reversed(list(enumerate(self.dims))):
+
+            index = indices.get(dim, slice(None))
+
+            if isinstance(index, slice):
+                index = np.arange(self.coords[dim].size)[index]
+
+            values = np.take(values, index, axis=axis)
+
+            if np.ndim(index) > 0:
+                dims.insert(0, dim)
+                coords[dim] = self.coords[dim][index]
+
+        if not dims:
+            return values[()]
+
+        return LabeledArray(values, dims, coords)
+
+    def sel(self, **labels):
+        """Selects by coordinate label along the named dimensions; a scalar label drops the dimension."""
+        indices = {}
+
+        for dim, label in labels.items():
+
+            coords = self.coords[dim]
+
+            positions = [np.flatnonzero(np.isclose(coords, value)) for value in np.ravel(label)]
+
+            if any(position.size != 1 for position in positions):
+                raise KeyError(f"Label {label!r} is not in the coordinates of {dim!r}.")
+
+            indices[dim] = positions[0][0] if np.ndim(label) == 0 else np.concatenate(positions)
+
+        return self.isel(**indices)
+
+    def __repr__(self):
+        """Returns the dimensions, coordinates and values."""
+        coords = "\n".join(f"  * {dim:<10} {self.coords[dim]}" for dim in self.dims)
+
+        return f"<LabeledArray ({', '.join(f'{dim}: {self.coords[dim].size}' for dim in self.dims)})>\n{self.values}\nCoordinates:\n{coords}"
+
+def sweep(axes, correlation="beggs_brill", nRates=32, nSteps=60, scheme="euler", maxiter=20, tol=1e-2, cache=True, **fixed):
+    """Function to evaluate the operating point of a well over the Cartesian product of parameter axes.
+
+    axes gives the values of the swept parameters and fixed the value of all the others, by
+    the field names of _field.WELL_DTYPE, e.g. sweep(dict(FWHP=..., GOR=..., Wcut=..., ID=...),
+    Pres=3000., J=1.5, ...). For every cell the tubing curve of the correlation is marched
+    with the batched traverse _traverse.vlp on nRates rates up to the absolute open flow of
+    the composite Darcy-Vogel IPR; the largest stable crossing is bracketed and refined by
+    Illinois regula falsi until the pressures agree within tol psi. All cells and rates are
+    evaluated together, one vectorized gradient call per traverse step.
+
+    The results are memoized on disk, keyed by a hash of the cell parameters and the solver
+    settings, so that an enlarged grid only computes its new cells. cache is True for the
+    nodepy cache directory, a directory path, or False to disable it.
+
+    Returns a LabeledArray of SWEEP_DTYPE with one dimension per axis."""
+    names = list(axes)
+
+    unknown = [name for name in names + list(fixed) if name not in WELL_DTYPE.names]
+    missing = [name for name in WELL_DTYPE.names if name not in axes and name not in fixed]
+
+    if unknown or missing:
+        raise ValueError(f"Unknown parameters {unknown} and missing parameters {missing}, see _field.WELL_DTYPE.")
+
+    coords = {name: np.ravel(np.asarray(axes[name], dtype=float)) for name in names}
+
+    grid = np.meshgrid(*coords.values(), indexing="ij")
+
+    shape = tuple(coord.size for coord in coords.values())
+
+    wells = np.zeros(int(np.prod(shape)), dtype=WELL_DTYPE)
+
+    for name in WELL_DTYPE.names:
+        wells[name] = grid[names.index(name)].ravel() if name in coords else fixed[name]
+
+    settings = repr((correlation, nRates, nSteps, scheme, maxiter, tol)).encode()
+
+    keys = np.array([hashlib.blake2b(settings + well.tobytes(), digest_size=16).digest() for well in wells], dtype="S16")
+
+    results = np.full(wells.size, np.nan, dtype=SWEEP_DTYPE)
+
+    store = {}
+
+    if cache:
+        folder = cachedir("sweep") if cache is True else cache
+        path = os.path.join(folder, f"{hashlib.blake2b(settings, digest_size=16).hexdigest()}.npz")
+
+        if os.path.exists(path):
+            with np.load(path) as data:
+                store = dict(zip(data["keys"].tolist(), data["values"]))
+
+    known = np.array([key in store for key in keys.tolist()], dtype=bool)
+
+    if np.any(known):
+        results[known] = [tuple(store[key]) for key in keys[known].tolist()]
+
+    if not np.all(known):
+        results[~known] = _operating(wells[~known], CORRELATIONS[correlation].Pgrad_array, nRates, nSteps, scheme, maxiter, tol)
+
+        if cache:
+            store.update(zip(keys[~known].tolist(), results[~known].tolist()))
+
+            # written under a temporary name first so that concurrent readers never load a partial file
+            temp = f"{os.path.splitext(path)[0]}.{os.getpid()}.tmp.npz"
+
+            np.savez(temp, keys=np.array(list(store), dtype="S16"), values=np.array(list(store.values()), dtype=float).reshape((-1, 2)))
+
+            os.replace(temp, path)
+
+    return LabeledArray(results.reshape(shape), names, coords)
+
+def _operating(wells, Pgrad_array, nRates, nSteps, scheme, maxiter, tol):
+    """Returns the largest stable operating points of the wells as a SWEEP_DTYPE array."""
+
+    def residual(index, q):
+        """Returns the IPR minus the tubing bottomhole pressure of the indexed wells at the rates."""
+        w = {name: wells[name][index].reshape(index.shape + (1,) * (q.ndim - 1)) for name in WELL_DTYPE.names}
+
+        _, press, _ = vlp(Pgrad_array, w["FWHP"], w["FWHT"], q, q * w["Wcut"] / (1 - w["Wcut"]), w["GOR"], w["GasGrav"], w["API"],
+            w["WaterGrav"], w["ID"], w["Angle"], w["Depth"], w["FBHT"], nSteps=nSteps, scheme=scheme)
+
+        return inflow.partial(w["Pb"], w["Pres"], rate=q, PI=w["J"]) - press[..., -1]
+
+    inflow = IPR()
+
+    results = np.full(wells.size, np.nan, dtype=SWEEP_DTYPE)
+
+    everyone = np.arange(wells.size)
+
+    AOF = inflow.partial(wells["Pb"], wells["Pres"], 0., PI=wells["J"])
+
+    rates = AOF[:, None] * np.linspace(1e-3, 1 - 1e-9, nRates)
+
+    values = residual(everyone, rates)
+
+    #stable crossings: the tubing curve rises above the inflow curve; the last one is taken
+    crossing = (values[:, :-1] > 0) & (values[:, 1:] <= 0)
+
+    active = np.flatnonzero(np.any(crossing, axis=1))
+
+    k = nRates - 2 - np.argmax(crossing[active, ::-1], axis=1)
+
+    a, b = rates[active, k], rates[active, k + 1]
+    fa, fb = values[active, k], values[active, k + 1]
+
+    side = np.zeros(active.size, dtype=int)
+
+    for _ in range(maxiter):
+
+        if active.size == 0:
+            break
+
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = residual(active, c)
+
+        results["rate"][active] = c
+
+        left = fc > 0
+
+        #Illinois modification: halve the value of an end point that is kept twice in a row
+        fb = np.where(left & (side == 1), fb / 2, fb)
+        fa = np.where(~left & (side == -1), fa / 2, fa)
+
+        a, fa = np.where(left, c, a), np.where(left, fc, fa)
+        b, fb = np.where(left, b, c), np.where(left, fb, fc)
+
+        side = np.where(left, 1, -1)
+
+        going = ~(np.abs(fc) <= tol)
+
+        active, a, b, fa, fb, side = active[going], a[going], b[going], fa[going], fb[going], side[going]
+
+    flowing = ~np.isnan(results["rate"])
+
+    results["pwf"][flowing] = inflow.partial(wells["Pb"][flowing], wells["Pres"][flowing], rate=results["rate"][flowing], PI=wells["J"][flowing])
+
+    return results
@@ -0,0 +1,246 @@
+# coding=utf-8
+"""Pressure traverse engines integrating dP/dz of the gradient correlations along the well."""
+import numpy as np
+
+#Fields of a streamed traverse point
+TRAVERSE_DTYPE = np.dtype([
+    ("depth", "f8"),        #measured depth, ft
+    ("press", "f8"),        #pressure, psia
+    ("temp", "f8"),         #temperature, °F
+    ("regime", "i1"),       #flow regime of the correlation, 0 if undefined
+    ("holdup", "f8"),       #liquid holdup, fraction
+    ])
+
+#Dormand-Prince 5(4) tableau: nodes, stage coefficients, 5th order weights and error weights
+DOPRI_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+DOPRI_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+    ]
+DOPRI_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+def dopri_step(fun, z, y, f0, h):
+    """Takes one Dormand-Prince 5(4) step of dy/dz = fun(z, y) from z to z + h.
+
+    The state y and the step h may be arrays that broadcast against each other, in which
+    case every element is advanced with its own step. f0 is fun(z, y); the returned
+    derivative at the new point is reused as f0 of the next step (first same as last).
+
+    Returns the 5th order solution, its local error estimate, the derivative at the new
+    point and the number of fun evaluations (six)."""
+    K = [f0]
+    for C, A in zip(DOPRI_C[1:], DOPRI_A[1:]):
+        y_new = y + h * sum(a * k for a, k in zip(A, K) if a != 0)
+        K.append(fun(z + C * h, y_new))
+    y_err = h * sum(e * k for e, k in zip(DOPRI_E, K) if e != 0)
+    return y_new, y_err, K[-1], len(K) - 1
+
+class Profile():
+    """Pressure and temperature profile of a traverse in preallocated arrays.
+
+    Attributes:
+        depth (np.ndarray)  : Measured depths of the accepted steps, ft.
+        press (np.ndarray)  : Pressures at the depths, psia.
+        temp (np.ndarray)   : Temperatures at the depths, °F.
+        nfev (int)          : Number of gradient evaluations used.
+        nsteps (int)        : Number of accepted steps.
+        nreject (int)       : Number of rejected steps.
+    """
+
+    def __init__(self, capacity=64):
+        """Allocates the arrays for the given number of points; they grow by doubling if needed."""
+        self._data = np.empty((3, capacity))
+        self.size = 0
+        self.nfev = 0
+        self.nsteps = 0
+        self.nreject = 0
+
+    def append(self, depth, press, temp):
+        """Stores a point, doubling the capacity when the arrays are full."""
+        if self.size == self._data.shape[1]:
+            self._data = np.concatenate((self._data, np.empty_like(self._data)), axis=1)
+        self._data[:, self.size] = depth, press, temp
+        self.size += 1
+
+    @property
+    def depth(self):
+        """Getter for the depths of the profile."""
+        return self._data[0, :self.size]
+
+    @property
+    def press(self):
+        """Getter for the pressures of the profile."""
+        return self._data[1, :self.size]
+
+    @property
+    def temp(self):
+        """Getter for the temperatures of the profile."""
+        return self._data[2, :self.size]
+
+def traverse(Pgrad, FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+    rtol=1e-5, atol=1e-2, first_step=None, max_step=None, capacity=64):
+    """Function to integrate the pressure traverse from the wellhead down to Depth with an
+    adaptive embedded Runge-Kutta (Dormand-Prince 5(4)) scheme and error control.
+
+    The temperature varies linearly from FWHT at the wellhead to FBHT at Depth. A step is
+    accepted when its local error is below atol + rtol * P (psia); the next step size is
+    then chosen from the error estimate, so that smooth parts of the well take few steps.
+
+    Pgrad      gradient function with the signature of _beggs_brill.Pgrad, psi/ft
+    first_step initial step, ft (default is Depth / 10)
+    max_step   largest step, ft (default is Depth)
+
+    Returns a Profile holding the depths, pressures, temperatures and the number of
+    gradient evaluations used."""
+    Tgrad = (FBHT - FWHT) / Depth
+
+    args = (Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle)
+
+    def fun(z, p):
+        return Pgrad(p, FWHT + Tgrad * z, *args)
+
+    profile = Profile(capacity)
+
+    max_step = Depth if max_step is None else max_step
+
+    z, p = 0., float(FWHP)
+    h = min(Depth / 10 if first_step is None else first_step, max_step)
+
+    f = fun(z, p)
+    profile.nfev += 1
+    profile.append(z, p, FWHT)
+
+    while z < Depth:
+
+        h = min(h, Depth - z)
+
+        p_new, p_err, f_new, nfev = dopri_step(fun, z, p, f, h)
+        profile.nfev += nfev
+
+        err = abs(p_err) / (atol + rtol * max(abs(p), abs(p_new)))
+
+        if err <= 1:
+            z, p, f = (Depth if h == Depth - z else z + h), p_new, f_new
+            profile.append(z, p, FWHT + Tgrad * z)
+            profile.nsteps += 1
+        else:
+            profile.nreject += 1
+
+        h = min(max_step, h * min(5., max(0.2, 0.9 * (err if err > 0 else 1e-10) ** -0.2)))
+
+        if h < 1e-8 * Depth:
+            raise RuntimeError(f"Traverse step size underflow at depth {z} ft, pressure {p} psia.")
+
+    return profile
+
+def vlp(Pgrad_array, FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+    nSteps=60, scheme="euler"):
+    """Function to march the pressure traverses of many rates (or wells) down the well together.
+
+    All arguments broadcast against each other, e.g. an array of oil rates with scalar well
+    data builds a VLP family. Every state shares the same fractional depth grid of nSteps
+    intervals, so each step makes one vectorized gradient call per stage for all states:
+    one with scheme="euler", two with "heun" and four with "rk4".
+
+    Pgrad_array gradient function with the signature of _beggs_brill.Pgrad_array, psi/ft
+
+    Returns the depths, pressures and temperatures as arrays of shape (*states, nSteps + 1),
+    i.e. (n_rates, n_depths) for a vector of rates."""
+    FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT = np.broadcast_arrays(
+        *(np.asarray(arg, dtype=float) for arg in (FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT)))
+
+    args = (Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle)
+
+    stages = {"euler": ((0.,), (1.,)), "heun": ((0., 1.), (0.5, 0.5)), "rk4": ((0., 0.5, 0.5, 1.), (1 / 6, 1 / 3, 1 / 3, 1 / 6))}
+
+    if scheme not in stages:
+        raise ValueError(f"Unknown scheme {scheme!r}, use 'euler', 'heun' or 'rk4'.")
+
+    nodes, weights = stages[scheme]
+
+    fraction = np.linspace(0., 1., nSteps + 1)
+
+    depth = Depth[..., None] * fraction
+    temp = FWHT[..., None] + (FBHT - FWHT)[..., None] * fraction
+    press = np.empty(depth.shape)
+
+    press[..., 0] = FWHP
+
+    dz = Depth / nSteps
+    dT = (FBHT - FWHT) / nSteps
+
+    for i in range(nSteps):
+
+        p, T = press[..., i], temp[..., i]
+
+        slope = np.zeros(p.shape)
+        k = np.zeros(p.shape)
+
+        for node, weight in zip(nodes, weights):
+            k = Pgrad_array(p + node * dz * k, T + node * dT, *args)
+            slope += weight * k
+
+        press[..., i + 1] = p + dz * slope
+
+    return depth, press, temp
+
+def stream(Pgrad, FWHP, FWHT, Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle, Depth, FBHT,
+    nSteps=60, chunksize=4096, until=None, final=False):
+    """Generator marching the pressure traverse from the wellhead down to Depth in nSteps
+    equal explicit Euler steps, and yielding the profile in chunks.
+
+    Every step carries the pressure to its bottom with the gradient at its top, and the
+    temperature is linear in depth, so that the profile is the one of vlp with the euler
+    scheme. The legacy Pwf_q loops of the correlations lag one step behind it: they apply
+    the gradient of the previous step, and end at a different bottomhole pressure.
+
+    Every chunk is a new TRAVERSE_DTYPE record array of at most chunksize points, so that the
+    consumer may keep it, write it to disk or drop it; the profile itself is never held in
+    memory. The regime and the holdup of a point are the ones of the gradient evaluated there.
+
+    until  optional callable until(depth, press, temp) of the scalar values at every point;
+           the march stops after the first point where it returns True, e.g.
+           until=lambda z, p, T: p < _pvt.Psep
+    final  when True only the last point is yielded, as a record array of length one; the
+           march then keeps scalars only and allocates nothing per step
+
+    Pgrad  gradient function with the signature and the full_output of _beggs_brill.Pgrad, psi/ft"""
+    Tgrad = (FBHT - FWHT) / Depth
+
+    args = (Oil_Rate, Water_Rate, GOR, GasGrav, API, WaterGrav, ID, Angle)
+
+    dz = Depth / nSteps
+
+    z, p, T = 0., float(FWHP), float(FWHT)
+
+    if not final:
+        chunk, size = np.empty(min(chunksize, nSteps + 1), dtype=TRAVERSE_DTYPE), 0
+
+    for i in range(nSteps + 1):
+
+        grad, regime, holdup = Pgrad(p, T, *args, full_output=True)
+
+        stop = i == nSteps or (until is not None and until(z, p, T))
+
+        if not final:
+            chunk[size] = z, p, T, regime, holdup
+            size += 1
+
+            if stop or size == chunk.size:
+                yield chunk[:size]
+
+                if not stop:
+                    chunk, size = np.empty(min(chunksize, nSteps - i), dtype=TRAVERSE_DTYPE), 0
+
+        if stop:
+            break
+
+        z, p, T = dz * (i + 1), p + dz * grad, FWHT + Tgrad * dz * (i + 1)
+
+    if final:
+        yield np.array([(z, p, T, regime, holdup)], dtype=TRAVERSE_DTYPE)
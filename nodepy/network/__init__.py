@@ -0,0 +1,3 @@
+from ._network import Node, Edge, Network
+
+from ._gradient import GlobalGradient
\ No newline at end of file
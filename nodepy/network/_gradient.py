@@ -0,0 +1,180 @@
+import logging
+
+import numpy as np
+
+from scipy import sparse
+from scipy.sparse import linalg
+
+class GlobalGradient():
+	"""
+	Steady-state network solver based on the global gradient method of Todini and Pilati.
+
+	For every edge e from node i to node j, the head loss h(Q) of its model balances the head
+	difference H_i-H_j, and at every junction the inflow minus the outflow equals the demand.
+	Each Newton iteration eliminates the flow corrections and solves the sparse symmetric system
+
+		(A12' D^-1 A12) dH = A12' D^-1 r1 - r2,
+
+	where A12 is the edge-junction incidence matrix, D holds the analytical derivatives dh/dQ
+	returned by the models, r1 is the head loss residual and r2 is the continuity residual. The
+	edge evaluations are vectorized per model group, so that the cost of an iteration is linear
+	in the number of edges besides the sparse solve.
+
+	The transition zone, where DarcyWeisbach.friction is undefined, is bridged by a linear head
+	loss between the laminar and turbulent limits so that the iterations stay finite.
+
+	Attributes:
+		flows (np.ndarray): Edge flow rates, positive from source to target.
+		heads (np.ndarray): Node heads in the order the nodes were added.
+		niter (int): Number of Newton iterations used.
+		converged (bool): True if the relative flow correction and continuity residual met the tolerance.
+	"""
+
+	def __init__(self,network):
+		"""Assembles the incidence matrices and the transition bridges of the network."""
+		self.network = network
+
+		nodes = list(network.nodes.values())
+
+		self.fixed = np.array([node.fixed for node in nodes],dtype=bool)
+
+		if not np.any(self.fixed):
+			raise ValueError("The network requires at least one node with a fixed head.")
+
+		if len(network)==0:
+			raise ValueError("The network has no edges.")
+
+		self.H0 = np.array([node.head for node in nodes if node.fixed],dtype=float)
+
+		self.demand = np.array([node.demand for node in nodes if not node.fixed],dtype=float)
+
+		ne,nn = len(network),len(nodes)
+
+		rows = np.tile(np.arange(ne),2)
+		cols = np.concatenate((network.sources,network.targets))
+		data = np.concatenate((np.ones(ne),-np.ones(ne)))
+
+		A = sparse.csc_matrix((data,(rows,cols)),shape=(ne,nn))
+
+		self.A12 = A[:,~self.fixed].tocsr()
+		self.A10 = A[:,self.fixed].tocsr()
+
+		self.A21 = self.A12.T.tocsr()
+
+		self.groups = network.groups
+
+		self.bridges = [self.bridge(model,options,indices.size) for indices,model,options in self.groups]
+
+	@staticmethod
+	def bridge(model,options,size):
+		"""Returns the flow limits, head loss and slope of the transition zone for Darcy-Weisbach models."""
+		if not hasattr(model,"reynolds"):
+			return None
+
+		ratio = model.reynolds(np.ones((size,1))).ravel()
+
+		qL = model.LOWER_REYNOLDS_LIMIT/ratio*(1-1e-9)
+		qU = model.UPPER_REYNOLDS_LIMIT/ratio*(1+1e-9)
+
+		hL = model.get(qL.reshape((-1,1)),**options).ravel()
+		hU = model.get(qU.reshape((-1,1)),**options).ravel()
+
+		return qL,qU,hL,(hU-hL)/(qU-qL)
+
+	def headloss(self,flows:np.ndarray):
+		"""Returns the signed head losses and their derivatives for the edge flow rates."""
+		h = np.empty_like(flows)
+		d = np.empty_like(flows)
+
+		for (indices,model,options),bridge in zip(self.groups,self.bridges):
+
+			Q = np.maximum(np.abs(flows[indices]),self.qmin[indices])
+
+			hg = model.get(Q.reshape((-1,1)),**options).ravel()
+			dg = model.derivative(Q.reshape((-1,1)),**options).ravel()
+
+			if bridge is not None:
+				qL,qU,hL,slope = bridge
+				zone = np.logical_and(Q>=qL,Q<=qU)
+				hg[zone] = hL[zone]+slope[zone]*(Q[zone]-qL[zone])
+				dg[zone] = slope[zone]
+
+			h[indices] = np.sign(flows[indices])*hg
+			d[indices] = dg
+
+		return h,d
+
+	def solve(self,flows:np.ndarray=None,tol:float=1e-6,maxiter:int=50,linsolve:str="direct",**kwargs):
+		"""Solves the network with Newton iterations on the global gradient system.
+
+		Args:
+			flows (np.ndarray, optional): Initial edge flow rates (default is a unit velocity in every pipe).
+			tol (float, optional): Tolerance on sum(|dQ|)/sum(|Q|) and on the continuity residual
+				sum(|A21 Q+q|)/sum(|Q|) (default=1e-6).
+			maxiter (int, optional): Maximum number of Newton iterations (default=50).
+			linsolve (str, optional): "direct" for a sparse LU solve or "cg" for Jacobi preconditioned
+				conjugate gradients (default="direct").
+			**kwargs: Keyword arguments passed to scipy.sparse.linalg.cg.
+
+		Returns:
+			GlobalGradient: The solver itself with flows, heads, niter and converged set.
+
+		"""
+		scale = np.empty(len(self.network))
+
+		for indices,model,options in self.groups:
+			scale[indices] = np.ravel(model.pipe.csa)
+
+		self.qmin = 1e-9*scale
+
+		Q = scale.copy() if flows is None else np.array(flows,dtype=float)
+
+		H = np.full(self.A12.shape[1],self.H0.max())
+
+		h0 = self.A10@self.H0
+
+		self.converged = False
+
+		for self.niter in range(1,maxiter+1):
+
+			h,d = self.headloss(Q)
+
+			w = 1/np.maximum(d,1e-12*np.max(d))
+
+			r1 = h-self.A12@H-h0
+			r2 = self.A21@Q+self.demand
+
+			M = (self.A21@sparse.diags(w)@self.A12).tocsc()
+			b = self.A21@(w*r1)-r2
+
+			if linsolve=="direct":
+				dH = linalg.spsolve(M,b,permc_spec="MMD_AT_PLUS_A")
+			elif linsolve=="cg":
+				dH,info = linalg.cg(M,b,M=sparse.diags(1/M.diagonal()),**kwargs)
+				if info!=0:
+					logging.warning(f"Conjugate gradients stopped with info {info} in the global gradient iteration {self.niter}.")
+			else:
+				raise ValueError(f"Unknown linear solver {linsolve!r}, use 'direct' or 'cg'.")
+
+			dQ = w*(self.A12@dH-r1)
+
+			H += dH
+			Q += dQ
+
+			#an inexact linear solve leaves a continuity residual that the flow correction does not show
+			r2 = self.A21@Q+self.demand
+
+			if np.sum(np.abs(dQ))<=tol*np.sum(np.abs(Q)) and np.sum(np.abs(r2))<=tol*np.sum(np.abs(Q)):
+				self.converged = True
+				break
+
+		if not self.converged:
+			logging.warning(f"Global gradient iterations did not converge in {maxiter} iterations.")
+
+		self.flows = Q
+
+		self.heads = np.empty(self.fixed.size)
+		self.heads[self.fixed] = self.H0
+		self.heads[~self.fixed] = H
+
+		return self
@@ -0,0 +1,168 @@
+import numpy as np
+
+from ..pressure_drop._pipe import Pipe, PipeArray
+
+class Node():
+	"""
+	A node of a pipe network.
+
+	Attributes:
+		name (hashable): Unique name of the node.
+		head (float): Fixed hydraulic head of a source node, None for a junction.
+		demand (float): Flow rate leaving the network at a junction (negative for injection).
+		index (int): Position of the node in the network.
+	"""
+
+	def __init__(self,name,head:float=None,demand:float=0.,index:int=None):
+		"""Initializes a node with a fixed head (source) or a demand (junction)."""
+		self.name = name
+		self.head = head
+		self.demand = demand
+		self.index = index
+
+	@property
+	def fixed(self):
+		"""Returns True if the node has a fixed head."""
+		return self.head is not None
+
+class Edge():
+	"""
+	A directed edge of a pipe network carrying flow from the source node to the target node.
+
+	Attributes:
+		source (Node): Upstream end for positive flow rates.
+		target (Node): Downstream end for positive flow rates.
+		model (PressureDrop): DarcyWeisbach or HazenWilliams model on a Pipe.
+		options (dict): Keyword arguments passed to the model, e.g. method or C.
+		index (int): Position of the edge in the network.
+		row (int): Row of the edge pipe if the model is built on a PipeArray, None otherwise.
+	"""
+
+	def __init__(self,source:Node,target:Node,model,index:int=None,row:int=None,**options):
+		"""Initializes an edge between two nodes with its pressure drop model."""
+		self.source = source
+		self.target = target
+		self.model = model
+		self.options = options
+		self.index = index
+		self.row = row
+
+	@property
+	def pipe(self):
+		"""Returns the pipe of the edge."""
+		if self.row is None:
+			return self.model.pipe
+
+		return self.model.pipe[self.row]
+
+class Network():
+	"""
+	A steady-state pipe network made of nodes and edges referencing pressure drop models.
+
+	Single edges are added with add_edge and batches of edges sharing one model built on a
+	PipeArray with add_edges. Before solving, the edges are grouped by model type, fluid and
+	options so that every group is evaluated with one vectorized model call.
+	"""
+
+	def __init__(self):
+		"""Initializes an empty network."""
+		self.nodes = {}
+		self.edges = []
+
+		self._batches = []
+		self._groups = []
+
+	def __len__(self):
+		"""Returns the number of edges."""
+		return len(self.edges)
+
+	def add_node(self,name,head:float=None,demand:float=0.) -> Node:
+		"""Adds a source node if the head is given, a junction otherwise."""
+		if name in self.nodes:
+			raise ValueError(f"Node {name!r} already exists in the network.")
+
+		node = Node(name,head,demand,index=len(self.nodes))
+
+		self.nodes[name] = node
+
+		return node
+
+	def add_edge(self,source,target,model,**options) -> Edge:
+		"""Adds an edge from the source node name to the target node name."""
+		if not isinstance(model.pipe,Pipe):
+			raise TypeError("The model of a single edge must be built on a Pipe, use add_edges for a PipeArray.")
+
+		edge = Edge(self.nodes[source],self.nodes[target],model,index=len(self.edges),**options)
+
+		self.edges.append(edge)
+
+		self._groups = []
+
+		return edge
+
+	def add_edges(self,sources,targets,model,**options) -> np.ndarray:
+		"""Adds a batch of edges whose model is built on a PipeArray, one pipe per edge.
+
+		Returns the indices of the new edges.
+		"""
+		if not isinstance(model.pipe,PipeArray):
+			raise TypeError("The model of an edge batch must be built on a PipeArray.")
+
+		if len(sources)!=len(model.pipe) or len(targets)!=len(model.pipe):
+			raise ValueError("The number of sources, targets and pipes must be the same.")
+
+		start = len(self.edges)
+
+		for row,(source,target) in enumerate(zip(sources,targets)):
+			self.edges.append(Edge(self.nodes[source],self.nodes[target],model,index=start+row,row=row,**options))
+
+		indices = np.arange(start,len(self.edges))
+
+		self._batches.append((indices,model,options))
+		self._groups = []
+
+		return indices
+
+	@property
+	def sources(self):
+		"""Returns the source node indices of the edges."""
+		return np.fromiter((edge.source.index for edge in self.edges),dtype=int,count=len(self.edges))
+
+	@property
+	def targets(self):
+		"""Returns the target node indices of the edges."""
+		return np.fromiter((edge.target.index for edge in self.edges),dtype=int,count=len(self.edges))
+
+	@property
+	def groups(self):
+		"""Returns the list of (edge indices, model, options) evaluated with one call each."""
+		if not self._groups:
+			self._groups = self.compile()
+
+		return self._groups
+
+	def compile(self) -> list:
+		"""Groups the single edges by model type, fluid and options, stacking their pipes into PipeArrays."""
+		singles = {}
+
+		for edge in self.edges:
+
+			if edge.row is not None:
+				continue
+
+			key = (type(edge.model),id(edge.model.fluid),tuple(sorted(edge.options.items())))
+			singles.setdefault(key,(edge.model,edge.options,[]))[2].append(edge.index)
+
+		groups = list(self._batches)
+
+		for model,options,indices in singles.values():
+			pipes = PipeArray.from_pipes(self.edges[index].pipe for index in indices)
+			groups.append((np.array(indices),type(model)(pipes,model.fluid),options))
+
+		return groups
+
+	def solve(self,**kwargs):
+		"""Solves the steady-state flows and heads with the global gradient method."""
+		from ._gradient import GlobalGradient
+
+		return GlobalGradient(self).solve(**kwargs)
@@ -1,4 +1,8 @@
-from ._pipe import Pipe
+from ._pipe import Pipe, PipeArray
 
 from ._darcy_weisbach import DarcyWeisbach
-from ._hazen_williams import HazenWilliams
\ No newline at end of file
+from ._compressible import Compressible
+from ._gas_pipeline import GasPipeline
+from ._hazen_williams import HazenWilliams
+
+from ._friction_table import FrictionTable
\ No newline at end of file
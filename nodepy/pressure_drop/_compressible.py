@@ -1,33 +1,272 @@
+import functools
+
+import numpy as np
+
+from scipy.optimize import brentq
+
 from ._darcy_weisbach import DarcyWeisbach
 
 class Compressible(DarcyWeisbach):
+    """
+    Isothermal flow of an ideal gas in a horizontal pipe, in SI units.
+
+    The mass flow of the pipe follows from the integrated momentum balance,
+
+        (G/A)**2*(ln(P1/P2)+fD*L/(2*D)) = rho1*(P1**2-P2**2)/(2*P1),
+
+    and is largest when the downstream pressure drops to the critical pressure w*P1,
+    where w solves fD*L/D = 1/w**2-ln(1/w**2)-1. Below it the flow is choked and the
+    mass flow stays at its critical value.
 
-    def __init__(self,*args,**kwargs):
+    Attributes:
+        temperature (float) : Gas temperature, K.
+        molarweight (float) : Molar weight of the gas, kg/mol (default is the first
+                              component of fluid.molarweight).
+        fD (float)          : Darcy friction factor; when None it is calculated from
+                              the Reynolds number of the mass flow.
+
+    The pipe may be a Pipe or a PipeArray; the latter broadcasts all methods over
+    (pipes x pressures), as in DarcyWeisbach.
+    """
+    UGC = 8.314 # Universal gas constant (J/mol/K)
+
+    def __init__(self,*args,temperature:float=293.15,molarweight:float=None,fD:float=None,**kwargs):
 
         super().__init__(*args,**kwargs)
 
-    def get(self,P2,P1):
+        self.temperature = temperature
+
+        self.molarweight = self.fluid.molarweight[0] if molarweight is None else molarweight
+
+        self.fD = fD
+
+    def get(self,P2:float|np.ndarray,P1:float|np.ndarray,fD:float|np.ndarray=None,tol:float=1e-10,maxiter:int=8) -> np.ndarray:
+        """Calculates the mass flow rates, kg/s, for the downstream and upstream pressures, Pa.
+
+        The pressures broadcast against each other (and against the pipes of a PipeArray);
+        a downstream pressure below the critical one gives the choked mass flow. When no
+        friction factor is known, it is solved from the fixed point fD = friction_mass(G(fD)),
+        which contracts as fD depends weakly on the Reynolds number, by secant steps on its
+        residual; they stop once the residual of every fD is below tol relative to it, or
+        after maxiter steps.
+        """
+        P1,P2 = np.asarray(P1,dtype=float),np.asarray(P2,dtype=float)
+
+        fD = self.fD if fD is None else fD
+
+        if fD is not None:
+            return self._mass(P1,P2,fD)
+
+        fD = self.friction_mass(self._mass(P1,P2,self.haaland(1e7,self.epd)))
+
+        previous = None
+
+        for _ in range(maxiter):
+
+            G = self._mass(P1,P2,fD)
+
+            residual = self.friction_mass(G)-fD
+
+            #NaN friction factors, e.g. of invalid pressures, do not hold the others back
+            if not np.any(np.abs(residual)>tol*np.abs(fD)):
+                return G
+
+            if previous is None:
+                step = residual
+            else:
+                #secant steps, the plain fixed point step where the slope is undefined
+                with np.errstate(divide="ignore",invalid="ignore"):
+                    step = residual*(fD-previous[0])/(previous[1]-residual)
+                step = np.where(np.isfinite(step),step,residual)
+
+            previous = (fD,residual)
+
+            fD = fD+step
+
+        return self._mass(P1,P2,fD)
+
+    def _mass(self,P1:np.ndarray,P2:np.ndarray,fD:np.ndarray) -> np.ndarray:
+        """Returns the mass flow rates for the given friction factors, choked below the critical pressure.
+
+        The flow is choked where P2 < w*P1, i.e. where x-ln(x)-1 > fD*L/D for x = (P1/P2)**2,
+        so that the critical ratio is solved on the choked elements only."""
+        fLD = fD*self.pipe._ll/self.pipe._di
+
+        P1,P2,fLDs = np.broadcast_arrays(P1,P2,fLD)
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            x = (P1/P2)**2
+            choked = (P2<P1)&((P2<=0)|(x-np.log(x)-1>fLDs))
+
+        if np.any(choked):
+            P2 = P2.copy()
+            P2[choked] = self.critical(fLDs[choked])*P1[choked]
+
+        return self._flow(P1,P2,fLD,self.pipe._di)
+
+    def _flow(self,P1:np.ndarray,P2:np.ndarray,fLD:np.ndarray,di:np.ndarray) -> np.ndarray:
+        """Returns the mass flow rates of the momentum balance, zero where P2 is not below P1."""
+        rho1 = (P1*self.molarweight)/(self.UGC*self.temperature)
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            G = (np.pi*di**2/4)*np.sqrt(rho1*(P1**2-P2**2)/(2*P1*(np.log(P1/P2)+fLD/2)))
+
+        return np.where(P2<P1,G,0.)[()]
+
+    def downstream(self,G:float|np.ndarray,P1:float|np.ndarray,fD:float|np.ndarray=None,xtol:float=1e-3,maxiter:int=60) -> np.ndarray:
+        """Calculates the downstream pressures, Pa, that carry the mass flow rates, kg/s, from
+        the upstream pressures, Pa.
+
+        The mass flow increases monotonically as the downstream pressure falls from P1 to the
+        critical pressure, so every root is bracketed by these two and all of them are refined
+        together by Illinois regula falsi until the brackets are narrower than xtol, Pa. A mass
+        flow above the choked one has no downstream pressure and gives NaN.
+        """
+        G,P1 = np.broadcast_arrays(np.asarray(G,dtype=float),np.asarray(P1,dtype=float))
+
+        fD = self.fD if fD is None else fD
+        fD = self.friction_mass(G) if fD is None else fD
+
+        G,P1,fD = np.broadcast_arrays(G,P1,np.asarray(fD,dtype=float))
+
+        shape = np.broadcast_shapes(G.shape,np.shape(self.pipe._di))
+
+        G,P1,fD = (np.broadcast_to(value,shape).ravel() for value in (G,P1,fD))
+
+        fLD = fD*np.broadcast_to(self.pipe._ll,shape).ravel()/np.broadcast_to(self.pipe._di,shape).ravel()
+
+        di = np.broadcast_to(self.pipe._di,shape).ravel()
+
+        def residual(index,P2):
+            """Returns the mass flow of the indexed elements at P2 minus the target ones."""
+            return self._flow(P1[index],P2,fLD[index],di[index])-G[index]
+
+        P2 = np.full(G.shape,np.nan)
+
+        P2[G==0] = P1[G==0]
+
+        everyone = np.arange(G.size)
+
+        a = self.critical(fLD)*P1
+        b = P1.copy()
+
+        fa,fb = residual(everyone,a),-G
+
+        #mass flow rates above the choked one are left as NaN
+        active = np.flatnonzero((fa>=0)&(G>0))
+
+        P2[active[fa[active]==0]] = a[active[fa[active]==0]]
+
+        active = active[fa[active]>0]
+
+        a,b,fa,fb = a[active],b[active],fa[active],fb[active]
+
+        side = np.zeros(active.size,dtype=int)
+
+        for _ in range(maxiter):
+
+            if active.size==0:
+                break
+
+            c = (a*fb-b*fa)/(fb-fa)
+            fc = residual(active,c)
+
+            P2[active] = c
+
+            left = fc>0
+
+            #Illinois modification: halve the value of an end point that is kept twice in a row
+            fb = np.where(left&(side==1),fb/2,fb)
+            fa = np.where(~left&(side==-1),fa/2,fa)
+
+            a,fa = np.where(left,c,a),np.where(left,fc,fa)
+            b,fb = np.where(left,b,c),np.where(left,fb,fc)
+
+            side = np.where(left,1,-1)
+
+            going = (b-a>xtol)&(fc!=0)
+
+            active,a,b,fa,fb,side = active[going],a[going],b[going],fa[going],fb[going],side[going]
+
+        return P2.reshape(shape)[()]
+
+    def friction_mass(self,G:float|np.ndarray) -> np.ndarray:
+        """Computes the Darcy friction factor of the mass flow rates, kg/s, whose Reynolds number
+        G*D/(A*mu) does not change along an isothermal pipe.
+
+        The laminar friction is used below LOWER_REYNOLDS_LIMIT and the Colebrook equation above
+        it, so that the transition does not break the root finding of the pressures."""
+        Re = np.abs(np.asarray(G,dtype=float))*self.pipe._di/(self.csa*self.fluid._visc)
+
+        Re,epd = np.broadcast_arrays(np.maximum(Re,1e-12),np.asarray(self.epd,dtype=float))
+
+        turbulent = Re>=self.LOWER_REYNOLDS_LIMIT
+
+        fD = np.array(64/Re)
+
+        if np.any(turbulent):
+            fD[turbulent] = self.colebrook_newton(Re[turbulent],epd[turbulent])
+
+        return fD[()]
+
+    @property
+    def csa(self):
+        """Returns the cross-sectional areas of the pipes, m2."""
+        return np.pi*self.pipe._di**2/4
+
+    @property
+    def epd(self):
+        """Returns the relative roughness of the pipes."""
+        return 0. if self.pipe.epd is None else self.pipe.epd
+
+    @staticmethod
+    def critical(fLD:float|np.ndarray) -> np.ndarray:
+        """Returns the critical pressure ratios w of the fD*L/D values, solving
+        fD*L/D = 1/w**2-ln(1/w**2)-1.
+
+        Every distinct value is solved once and cached; beyond CRITICAL_CACHED distinct values,
+        e.g. a friction factor per element, they are solved together by Newton steps."""
+        fLD = np.asarray(fLD,dtype=float)
+
+        values,inverse = np.unique(fLD,return_inverse=True)
+
+        if values.size<=CRITICAL_CACHED:
+            ratios = np.array([_critical(value) for value in values.tolist()])
+        else:
+            ratios = _critical_array(values)
+
+        return ratios[inverse].reshape(fLD.shape)[()]
+
+#Largest number of distinct fD*L/D values that are solved one by one through the cache
+CRITICAL_CACHED = 256
+
+@functools.lru_cache(maxsize=4096)
+def _critical(fLD:float) -> float:
+    """Returns the critical pressure ratio of a single fD*L/D value."""
+    if not fLD>0:
+        return 1.
+
+    #with x = 1/w**2 the relation x-ln(x)-1 = fD*L/D has its root in (1, 2*(fD*L/D+1))
+    x = brentq(lambda x: x-np.log(x)-1-fLD,1.,2*(fLD+1),xtol=1e-14,rtol=1e-14)
+
+    return 1/np.sqrt(x)
 
-        rho1 = (P1*self.Fluid.molarweight[0])/(self.UGC*self.temperature)
-        rho2 = (P2*self.Fluid.molarweight[0])/(self.UGC*self.temperature)
+def _critical_array(fLD:np.ndarray,tol:float=1e-14,maxiter:int=50) -> np.ndarray:
+    """Returns the critical pressure ratios of an array of fD*L/D values.
 
-        nu1 = 1/rho1
-        nu2 = 1/rho2
+    The relation x-ln(x)-1 = fD*L/D is convex in x = 1/w**2, so that Newton steps from the
+    upper bound 2*(fD*L/D+1) of the root decrease monotonically onto it."""
+    c = np.maximum(fLD,0.)
 
-        Dp = P1**2-P2**2
-        Rp = np.log(P1/P2)
-        Ft = 4*self.phi*self.Pipe.length/self.Pipe.diameter
-        
-        G = self.Pipe.csa*np.sqrt(Dp/(2*P1*nu1*(Rp+Ft)))
+    x = 2*(c+1)
 
-        return G
+    for _ in range(maxiter):
 
-    def omega(self):
+        dx = (x-np.log(x)-1-c)/(1-1/x)
 
-        def objective(wc,LHS):
-            RHS = (1/wc)**2-(np.log(1/wc))**2-1
-            return (RHS-LHS)**2
+        x = np.maximum(x-dx,1.)
 
-        LHS = 8*self.phi*self.Pipe.length/self.Pipe.diameter
+        if np.all(np.abs(dx)<=tol*x):
+            break
 
-        self.omega = minimize_scalar(objective,args=(LHS,),bounds=((1e-5,1)),method='bounded').x
\ No newline at end of file
+    return np.where(c>0,1/np.sqrt(x),1.)
@@ -3,6 +3,7 @@ import numpy as np
 from scipy import optimize
 
 from ._pressure_drop import PressureDrop
+from ._friction_table import FrictionTable
 
 class DarcyWeisbach(PressureDrop):
 	"""
@@ -14,14 +15,22 @@ class DarcyWeisbach(PressureDrop):
 	Methods:
 		get(flow_rate: float) -> float:
 			Calculates the head loss due to friction.
+		derivative(flow_rate: float) -> float:
+			Calculates the derivative of the head loss with respect to the flow rate.
 		friction(flow_rate: float, method="colebrook") -> float:
 			Computes the Darcy friction factor based on flow regime.
 		reynolds(flow_rate: float) -> float:
 			Computes the Reynolds number.
+
+	The pipe may be a Pipe or a PipeArray; the latter broadcasts all methods over (pipes x rates).
 		
 	Static Methods:
 		colebrook(Re: float, epd: float) -> float:
 			Computes friction factor using the Colebrook equation.
+		colebrook_newton(Re: np.ndarray, epd: float) -> np.ndarray:
+			Computes friction factor solving the Colebrook equation with vectorized Newton steps.
+		table(Re: np.ndarray, epd: float) -> np.ndarray:
+			Computes friction factor interpolating a precomputed Colebrook table.
 		haaland(Re: float, epd: float) -> float:
 			Computes friction factor using the Haaland equation.
 		chen(Re: float, epd: float) -> float:
@@ -42,20 +51,57 @@ class DarcyWeisbach(PressureDrop):
 		super().__init__(*args,**kwargs)
 
 	def get(self,flow_rate:float|np.ndarray,**kwargs) -> float:
-		"""Calculates the head loss due to friction using the Darcy-Weisbach equation."""
+		"""Calculates the head loss due to friction using the Darcy-Weisbach equation.
+
+		For a PipeArray, the rates of shape (m,) are broadcast to (pipes x rates) and the
+		rates of shape (n,1) are paired with the pipes one to one.
+		"""
 		fD = self.friction(flow_rate,**kwargs)
 
-		v = flow_rate/self.pipe.csa
+		return self._head(fD,self.rates(flow_rate))
+
+	def _head(self,fD:np.ndarray,Q:np.ndarray) -> np.ndarray:
+		"""Returns the head loss for the given friction factor and flow rate."""
+		v = Q/self.pipe.csa
 		g = 9.80665 # Gravitational acceleration (m/s²)
 
 		return (fD * self.pipe.length * v**2) / (2*g*self.pipe.diam)
 
+	def derivative(self,flow_rate:float|np.ndarray,**kwargs) -> np.ndarray:
+		"""Calculates the analytical derivative of the head loss with respect to the flow rate.
+
+		With h = fD*L*v**2/(2*g*D), it is dh/dQ = h/Q*(2+dln(fD)/dln(Re)), where the laminar
+		friction gives dln(fD)/dln(Re) = -1 and the turbulent one is obtained by implicit
+		differentiation of the Colebrook equation for all turbulent correlations.
+		"""
+		Q = self.rates(flow_rate)
+
+		fD = self.friction(Q,**kwargs)
+
+		h = self._head(fD,Q)
+
+		Re = self.__reynolds_number
+
+		slope = np.full(Re.shape,np.nan)
+
+		slope[self.laminar] = -1.
+
+		turbulent = self.turbulent
+
+		if np.any(turbulent):
+			Re_,fD_ = Re[turbulent],fD[turbulent]
+			epd = np.broadcast_to(self.pipe.epd,Re.shape)[turbulent]
+			term = (2/np.log(10))*(2.51/Re_)/(epd/3.7+2.51/(Re_*np.sqrt(fD_)))
+			slope[turbulent] = -2*term/(1+term)
+
+		return h/Q*(2+slope)
+
 	def friction(self,flow_rate:float|np.ndarray,method:str="colebrook",**kwargs):
 		"""Computes the Darcy-Weisbach friction factor based on the flow regime.
 		
 		Args:
 			flow_rate (float): Volumetric flow rate in cubic meters per second (m³/s).
-			method (str, optional): Friction factor correlation method: "colebrook", "haaland", or "chen" (default="colebrook").
+			method (str, optional): Friction factor correlation method: "colebrook", "colebrook_newton", "table", "haaland", or "chen" (default="colebrook").
 
 		Returns:
 			float: Darcy friction factor.
@@ -74,18 +120,25 @@ class DarcyWeisbach(PressureDrop):
 
 		fD[c1] = 64/Re[c1]
 		fD[c2] = np.nan
-		fD[c3] = getattr(self,method)(Re[c3],self.pipe.epd,**kwargs)
+
+		if np.any(c3):
+			fD[c3] = getattr(self,method)(Re[c3],np.broadcast_to(self.pipe.epd,Re.shape)[c3],**kwargs)
 
 		return fD
 
 	def reynolds(self,flow_rate:float|np.ndarray) -> float:
 		"""Computes the Reynolds number for the given flow rate."""
-		Q = np.ravel(flow_rate)
+		Q = self.rates(flow_rate)
 
 		self.__reynolds_number = (4*self.fluid._rho*Q)/(np.pi*self.fluid._visc*self.pipe.diam)
 
 		return self.__reynolds_number
 
+	@staticmethod
+	def rates(flow_rate:float|np.ndarray) -> np.ndarray:
+		"""Returns the flow rates as an at least one dimensional float array."""
+		return np.atleast_1d(np.asarray(flow_rate,dtype=float))
+
 	@property
 	def laminar(self):
 		"""Returns True if the last calculated flow regime is laminar."""
@@ -116,6 +169,117 @@ class DarcyWeisbach(PressureDrop):
 		
 		return optimize.newton(func,64/Re,prime,args=(Re,epd),**kwargs)
 
+	@staticmethod
+	def colebrook_newton(Re:float|np.ndarray,epd:float|np.ndarray,tol:float=1e-12,maxiter:int=10,out:np.ndarray=None,chunk:int=16384) -> np.ndarray:
+		"""Computes the Darcy-Weisbach friction factor using the Colebrook equation solved
+		by fused NumPy Newton steps seeded with the Haaland equation.
+
+		The equation is solved for x = 1/sqrt(fD) in the form x+2*log10(epd/3.7+2.51*x/Re) = 0,
+		which is increasing and concave in x, so that Newton steps from the Haaland seed, which
+		is already close to the root, converge in two to three steps. The elements are solved
+		in chunks that stay in cache, in preallocated buffers; only the elements of a chunk that
+		have not met the tolerance yet are updated on each iteration.
+
+		Args:
+			Re (np.ndarray): Reynolds numbers in the turbulent regime.
+			epd (float or np.ndarray): Relative roughness broadcastable to Re.
+			tol (float, optional): Relative tolerance on the x update (default=1e-12).
+			maxiter (int, optional): Maximum number of Newton steps (default=10).
+			out (np.ndarray, optional): C-contiguous float array of the broadcast shape that
+				receives the friction factors, e.g. a buffer reused across calls.
+			chunk (int, optional): Number of elements solved together (default=16384).
+
+		Returns:
+			np.ndarray: Darcy friction factor with the broadcast shape of Re and epd.
+
+		"""
+		Re,epd = np.asarray(Re,dtype=float),np.asarray(epd,dtype=float)
+
+		shape = np.broadcast_shapes(Re.shape,epd.shape)
+
+		if out is None:
+			out = np.empty(shape)
+		elif out.shape!=shape or out.dtype!=float or not out.flags.c_contiguous:
+			raise ValueError(f"The out array must be a C-contiguous float array of the shape {shape}.")
+
+		Re = np.broadcast_to(Re,shape).reshape(-1)
+		a = np.broadcast_to(epd/3.7,shape).reshape(-1)
+		b = np.broadcast_to((epd/3.7)**1.11,shape).reshape(-1)
+
+		x = out.reshape(-1)
+
+		c = 2/np.log(10)
+
+		#w holds the argument of the logarithm, then the derivative of the equation
+		w = np.empty(min(chunk,x.size))
+		dx = np.empty(w.size)
+
+		index = np.arange(w.size)
+
+		for start in range(0,x.size,chunk):
+
+			Rc,ac,bc,xc = Re[start:start+chunk],a[start:start+chunk],b[start:start+chunk],x[start:start+chunk]
+
+			#Haaland seed
+			wc = w[:xc.size]
+			np.divide(6.9,Rc,out=wc)
+			np.add(wc,bc,out=wc)
+			np.log10(wc,out=wc)
+			np.multiply(wc,-1.8,out=xc)
+			np.absolute(xc,out=xc)
+
+			active = index[:xc.size]
+
+			for _ in range(maxiter):
+
+				#the whole chunk is updated in place until some of its elements converge
+				if active.size==xc.size:
+					xa,Ra,aa = xc,Rc,ac
+				else:
+					xa,Ra,aa = xc[active],Rc[active],ac[active]
+
+				wa,da = w[:active.size],dx[:active.size]
+
+				np.multiply(xa,2.51,out=wa)
+				np.divide(wa,Ra,out=wa)
+				np.add(wa,aa,out=wa)
+
+				np.log(wa,out=da)
+				da *= c
+				da += xa
+
+				np.multiply(wa,Ra,out=wa)
+				np.divide(2.51*c,wa,out=wa)
+				wa += 1
+
+				da /= wa
+
+				np.absolute(xa,out=wa)
+				wa *= tol
+
+				xa -= da
+
+				if active.size!=xc.size:
+					xc[active] = xa
+
+				#NaN updates, e.g. of invalid Reynolds numbers, leave the active set
+				np.absolute(da,out=da)
+				active = active[da>wa]
+
+				if active.size==0:
+					break
+
+		np.square(out,out=out)
+		np.divide(1.,out,out=out)
+
+		return out[()]
+
+	@staticmethod
+	def table(Re:float|np.ndarray,epd:float|np.ndarray,**kwargs) -> np.ndarray:
+		"""Computes the Darcy-Weisbach friction factor by bilinear interpolation of a memory-mapped
+		Colebrook table, see FrictionTable for the grid and its error bound."""
+		return FrictionTable.default(**kwargs)(Re,epd)
+
 	@staticmethod
 	def haaland(Re:float|np.ndarray,epd:float) -> float:
 		"""Computes the Darcy-Weisbach friction factor using the Haaland equation."""
@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+
+from .._cache import cachedir
+
+class FrictionTable():
+	"""
+	Tabulated Darcy-Weisbach friction factor of the Colebrook equation (Moody surface).
+
+	The natural logarithm of the friction factor is sampled once on a uniform grid in
+	log10(Re) x log10(epd), stored as a .npy file and memory-mapped on later uses. Queries
+	are answered by vectorized bilinear interpolation of log(fD).
+
+	With the default density of 64 nodes per decade of Re and 32 nodes per decade of epd,
+	the relative deviation from DarcyWeisbach.colebrook is below 2e-4 over the whole grid.
+	Relative roughness smaller than the grid minimum is clamped to it (the Colebrook term
+	epd/3.7 is negligible there). Points with Re below or above the grid, epd above it, or
+	NaN arguments fall back to DarcyWeisbach.colebrook_newton, so that nothing outside the
+	grid is extrapolated; below Re = 1e3 this is the Colebrook solution, not the laminar one.
+
+	Attributes:
+		path (str): Location of the .npy file holding log(fD).
+		table (np.ndarray): Memory-mapped log(fD) values with shape (Re nodes, epd nodes).
+	"""
+	REYNOLDS = (1e3,1e8)
+	ROUGHNESS = (1e-10,1e-1)
+
+	_instances = {}
+
+	def __init__(self,path:str=None,density:tuple=(64,32)):
+		"""
+		Loads the table from path, building and saving it first if the file does not exist.
+
+		Args:
+			path (str, optional): Location of the .npy file (default is in the nodepy cache directory).
+			density (tuple, optional): Grid nodes per decade of Re and epd (default=(64,32)).
+
+		"""
+		self.lre = np.log10(self.REYNOLDS)
+		self.lep = np.log10(self.ROUGHNESS)
+
+		self.shape = (
+			int(round(density[0]*(self.lre[1]-self.lre[0])))+1,
+			int(round(density[1]*(self.lep[1]-self.lep[0])))+1,
+			)
+
+		if path is None:
+			path = os.path.join(cachedir(),f"friction_{self.shape[0]}x{self.shape[1]}.npy")
+
+		self.path = path
+
+		if not os.path.exists(self.path):
+			self.build()
+
+		self.table = np.load(self.path,mmap_mode="r")
+
+	@classmethod
+	def default(cls,path:str=None,**kwargs):
+		"""Returns a shared table instance for the given path so that files are mapped once."""
+		key = (path,tuple(kwargs.get("density",(64,32))))
+
+		if key not in cls._instances:
+			cls._instances[key] = cls(path,**kwargs)
+
+		return cls._instances[key]
+
+	def build(self):
+		"""Samples log(fD) of the Colebrook equation on the grid and saves it to the path."""
+		from ._darcy_weisbach import DarcyWeisbach
+
+		Re = np.logspace(*self.lre,self.shape[0]).reshape((-1,1))
+		epd = np.logspace(*self.lep,self.shape[1]).reshape((1,-1))
+
+		table = np.log(DarcyWeisbach.colebrook_newton(Re,epd))
+
+		# written under a temporary name first so that concurrent readers never map a partial file
+		temp = f"{os.path.splitext(self.path)[0]}.{os.getpid()}.tmp.npy"
+
+		np.save(temp,table)
+
+		os.replace(temp,self.path)
+
+	def __call__(self,Re:float|np.ndarray,epd:float|np.ndarray) -> np.ndarray:
+		"""Returns the interpolated Darcy-Weisbach friction factor for the given Re and epd."""
+		Re,epd = np.broadcast_arrays(np.asarray(Re,dtype=float),np.asarray(epd,dtype=float))
+
+		u = (np.log10(Re)-self.lre[0])/(self.lre[1]-self.lre[0])*(self.shape[0]-1)
+		v = (np.log10(np.maximum(epd,self.ROUGHNESS[0]))-self.lep[0])/(self.lep[1]-self.lep[0])*(self.shape[1]-1)
+
+		#NaN arguments give arbitrary indices here and are replaced by the fallback below
+		with np.errstate(invalid="ignore"):
+			i = np.clip(np.floor(u).astype(int),0,self.shape[0]-2)
+			j = np.clip(np.floor(v).astype(int),0,self.shape[1]-2)
+
+		s,t = u-i,v-j
+
+		logf = (1-s)*((1-t)*self.table[i,j]+t*self.table[i,j+1])+s*((1-t)*self.table[i+1,j]+t*self.table[i+1,j+1])
+
+		#kept an array for scalar queries too, so that the fallback below can assign into it
+		fD = np.array(np.exp(logf))
+
+		outside = ~((u>=0)&(u<=self.shape[0]-1)&(v<=self.shape[1]-1))
+
+		if np.any(outside):
+			from ._darcy_weisbach import DarcyWeisbach
+			fD[outside] = DarcyWeisbach.colebrook_newton(Re[outside],epd[outside])
+
+		return fD[()]
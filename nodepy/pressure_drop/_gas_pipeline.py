@@ -0,0 +1,180 @@
+import collections
+import logging
+
+import numpy as np
+
+from .. import _fluid_props as FluidArrays
+from .._traverse import dopri_step
+
+from ._darcy_weisbach import DarcyWeisbach
+
+#Outlet state of the marched lines with the work done per line and the flags of the choked lines
+Outlet = collections.namedtuple("Outlet", "press temp nsteps nfev choked")
+
+class GasPipeline():
+    """
+    Non-isothermal flow of a real gas in pipelines, in SI units.
+
+    The pressure and temperature of every line are marched together from the inlet with the
+    coupled gradients
+
+        dP/dx = -(fD*rho*u**2/(2*D)+rho*g*sin(angle))/(1-rho*u**2/P)
+        dT/dx = -U*pi*D*(T-Tamb)/(G*cp)+jt*dP/dx
+
+    where the gas density follows the Z-factor of _fluid_props.zfact, the friction factor is
+    the Colebrook one of DarcyWeisbach at the Reynolds number of the local gas viscosity and
+    the heat is lost to the ambient through the overall coefficient U.
+
+    Attributes:
+        pipe (Pipe|PipeArray)   : Lines; a PipeArray marches all of its lines together.
+        gas_grav (float)        : Gas specific gravity (air = 1).
+        U (float)               : Overall heat transfer coefficient, W/m2/K.
+        Tamb (float)            : Ambient temperature, K.
+        cp (float)              : Isobaric heat capacity of the gas, J/kg/K.
+        jt (float)              : Joule-Thomson coefficient, K/Pa.
+        angle (float)           : Inclination of the lines from the horizontal, degrees.
+
+    All attributes may be arrays with one value per line.
+    """
+    UGC = 8.314 # Universal gas constant (J/mol/K)
+
+    def __init__(self,pipe,gas_grav:float,U:float=0.,Tamb:float=288.15,cp:float=2200.,jt:float=0.,angle:float=0.):
+
+        self.pipe = pipe
+
+        self.gas_grav, self.U, self.Tamb, self.cp, self.jt, self.angle = (
+            np.asarray(value,dtype=float) for value in (gas_grav,U,Tamb,cp,jt,angle))
+
+    def density(self,P:np.ndarray,T:np.ndarray) -> tuple:
+        """Returns the gas densities, kg/m3, and the Z-factors at the pressures, Pa, and temperatures, K."""
+        Z = FluidArrays.zfact(T*1.8/FluidArrays.Tc(self.gas_grav),(P/6894.757)/FluidArrays.Pc(self.gas_grav))
+
+        return P*(0.028964*self.gas_grav)/(Z*self.UGC*T), Z
+
+    def viscosity(self,P:np.ndarray,T:np.ndarray,Z:np.ndarray) -> np.ndarray:
+        """Returns the gas viscosities, Pa.s, at the pressures, Pa, temperatures, K, and Z-factors."""
+        return FluidArrays.gvisc(P/6894.757,T*1.8,Z,self.gas_grav)*1e-3
+
+    def gradient(self,G:np.ndarray,P:np.ndarray,T:np.ndarray) -> np.ndarray:
+        """Returns the pressure, Pa/m, and temperature, K/m, gradients of the mass flow rates, kg/s,
+        stacked along the first axis."""
+        di = np.ravel(self.pipe._di)
+        A = np.pi*di**2/4
+
+        #trial stages of a rejected step may leave the validity range of the correlations
+        with np.errstate(divide="ignore",invalid="ignore"):
+            rho, Z = self.density(P,T)
+
+            u = G/(rho*A)
+
+            Re = np.abs(G)*di/(A*self.viscosity(P,T,Z))
+
+            epd = np.broadcast_to(np.ravel(0. if self.pipe.epd is None else self.pipe.epd),Re.shape)
+
+            fD = np.where(Re<DarcyWeisbach.LOWER_REYNOLDS_LIMIT,64/Re,DarcyWeisbach.colebrook_newton(np.maximum(Re,1.),epd))
+
+            #the flow chokes where the kinetic term cancels the denominator, the gradients become NaN
+            dPdx = -(fD*rho*u**2/(2*di)+rho*9.80665*np.sin(np.radians(self.angle)))/np.where(rho*u**2<P,1-rho*u**2/P,np.nan)
+
+            dTdx = -self.U*np.pi*di*(T-self.Tamb)/(G*self.cp)+self.jt*dPdx
+
+        return np.stack((dPdx,dTdx))
+
+    def get(self,G:float|np.ndarray,P1:float|np.ndarray,T1:float|np.ndarray,**kwargs) -> np.ndarray:
+        """Calculates the outlet pressures, Pa, of the mass flow rates, kg/s, entering the lines at
+        P1, Pa, and T1, K; the keyword arguments are passed to march."""
+        return self.march(G,P1,T1,**kwargs).press
+
+    def march(self,G:float|np.ndarray,P1:float|np.ndarray,T1:float|np.ndarray,rtol:float=1e-6,atol:tuple=(10.,1e-3),
+        first_step:float=None,max_step:float=None,full_output:bool=False):
+        """Marches the pressures and temperatures of all lines from the inlet to the outlet with the
+        adaptive Dormand-Prince 5(4) scheme of _traverse.dopri_step.
+
+        Every line carries its own position and step size, so that one vectorized gradient call
+        per stage advances all of them; a step of a line is accepted when its local errors are
+        below atol + rtol*|y| for the pressure, Pa, and the temperature, K, and the next step is
+        sized from the error estimate. Steep parts, e.g. near the outlet of a line close to
+        choking, are therefore resolved finely while the rest takes long steps.
+
+        first_step  initial step, m (default is a hundredth of the line length)
+        max_step    largest step, m (default is the line length)
+
+        A line whose step size underflows, i.e. whose flow chokes before the outlet, stops
+        marching with NaN outlet pressure and temperature and is flagged in choked, so that it
+        does not cost the results of the other lines; a warning gives their number.
+
+        Returns an Outlet(press, temp, nsteps, nfev, choked) of arrays with one value per line;
+        with full_output also the list of the (3, n_points) arrays of positions, m, pressures and
+        temperatures of every line."""
+        length = np.ravel(np.asarray(self.pipe._ll,dtype=float))
+
+        G, P1, T1, length = (np.array(value,dtype=float) for value in np.broadcast_arrays(
+            np.ravel(G),np.ravel(P1),np.ravel(T1),length))
+
+        atol = np.asarray(atol,dtype=float).reshape((2,1))
+
+        max_step = length if max_step is None else np.broadcast_to(max_step,length.shape)
+
+        h = np.minimum(length/100 if first_step is None else np.broadcast_to(first_step,length.shape),max_step)
+
+        x = np.zeros(length.shape)
+        y = np.stack((P1,T1))
+
+        fun = lambda x, y: self.gradient(G,y[0],y[1])
+
+        f = fun(x,y)
+
+        nsteps = np.zeros(length.shape,dtype=int)
+        nfev = np.ones(length.shape,dtype=int)
+
+        choked = np.zeros(length.shape,dtype=bool)
+
+        if full_output:
+            points = [[(0.,*state)] for state in y.T.tolist()]
+
+        going = x<length
+
+        while np.any(going):
+
+            h = np.where(going,np.minimum(h,length-x),0.)
+
+            y_new, y_err, f_new, evals = dopri_step(fun,x,y,f,h)
+
+            nfev += going*evals
+
+            err = np.max(np.abs(y_err)/(atol+rtol*np.maximum(np.abs(y),np.abs(y_new))),axis=0)
+
+            #a NaN error, e.g. a choked stage, rejects the step and shrinks it
+            accept = going&(err<=1)
+
+            x = np.where(accept,np.where(h==length-x,length,x+h),x)
+            y = np.where(accept,y_new,y)
+            f = np.where(accept,f_new,f)
+
+            nsteps += accept
+
+            if full_output:
+                for index in np.flatnonzero(accept).tolist():
+                    points[index].append((x[index],*y[:,index]))
+
+            err = np.where(np.isnan(err),np.inf,err)
+
+            h = np.minimum(max_step,h*np.minimum(5.,np.maximum(0.2,0.9*np.where(err>0,err,1e-10)**-0.2)))
+
+            stalled = (x<length)&(h<1e-8*length)
+
+            if np.any(stalled):
+                choked |= stalled
+                y = np.where(stalled,np.nan,y)
+
+            going = (x<length)&~choked
+
+        if np.any(choked):
+            logging.warning(f"The flow chokes in {np.count_nonzero(choked)} of {choked.size} lines, their outlet states are NaN.")
+
+        outlet = Outlet(y[0],y[1],nsteps,nfev,choked)
+
+        if full_output:
+            return outlet, [np.array(line).T for line in points]
+
+        return outlet
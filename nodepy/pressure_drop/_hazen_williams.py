@@ -1,3 +1,5 @@
+import numpy as np
+
 from ._pressure_drop import PressureDrop
 
 class HazenWilliams(PressureDrop):
@@ -14,5 +16,13 @@ class HazenWilliams(PressureDrop):
 		super().__init__(*args,**kwargs)
 
 	def get(self,flow_rate,C:float=120.):
-		"""Returns the head loss due to friction."""
-		return (10.67 * self.pipe.length * flow_rate**1.852) / (C**1.852 * self.pipe.diam**4.87)
\ No newline at end of file
+		"""Returns the head loss due to friction; a PipeArray broadcasts it over (pipes x rates)."""
+		flow_rate = np.asarray(flow_rate,dtype=float)
+
+		return (10.67 * self.pipe.length * flow_rate**1.852) / (C**1.852 * self.pipe.diam**4.87)
+
+	def derivative(self,flow_rate,C:float=120.):
+		"""Returns the analytical derivative of the head loss with respect to the flow rate."""
+		flow_rate = np.asarray(flow_rate,dtype=float)
+
+		return 1.852*(10.67 * self.pipe.length * flow_rate**0.852) / (C**1.852 * self.pipe.diam**4.87)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 class Pipe():
     """A class representing a cylindrical pipe, providing its geometric properties.
     
@@ -137,6 +139,152 @@ class Pipe():
         """Returns the volume of the pipe (assuming a solid cylinder)."""
         self._volume = self._csa * self._ll
 
+class PipeArray():
+    """A structure-of-arrays collection of cylindrical pipes for batched evaluations.
+
+    The columns are stored as NumPy arrays of shape (n,1) in the same units as Pipe, so
+    that the pressure drop models broadcast them over a rate vector of shape (m,) to
+    (pipes x rates) results, or over a rate array of shape (n,1) to one rate per pipe.
+    
+    Attributes:
+        di (np.ndarray) : Inner diameters of the pipes, inch.
+        ll (np.ndarray) : Lengths of the pipes (default is 1.0), feet.
+        rr (np.ndarray) : Relative roughness of the pipes (default is 0.0, dimensionless).
+    
+    Properties:
+        radius, circ, surface, csa, volume (np.ndarray) : Same as Pipe, per pipe.
+
+    """
+    def __init__(self,di,ll=1.,rr=None):
+        """Initializes a PipeArray from diameter, length and relative roughness columns."""
+        di = np.ravel(np.asarray(di,dtype=float))
+
+        self.di = di
+        self.ll = np.broadcast_to(np.ravel(np.asarray(ll,dtype=float)),di.shape)
+        self.rr = np.broadcast_to(np.ravel(np.asarray(0. if rr is None else rr,dtype=float)),di.shape)
+
+    @classmethod
+    def from_pipes(cls,pipes):
+        """Stacks a sequence of Pipe objects into a PipeArray."""
+        pipes = list(pipes)
+
+        return cls(
+            [pipe.di for pipe in pipes],
+            [pipe.ll for pipe in pipes],
+            [0. if pipe.rr is None else pipe.rr for pipe in pipes],
+            )
+
+    def __len__(self):
+        """Returns the number of pipes."""
+        return self._di.shape[0]
+
+    def __getitem__(self,key):
+        """Returns a Pipe for an integer key and a PipeArray for slices and index arrays."""
+        if isinstance(key,(int,np.integer)):
+            return Pipe(float(self.di[key,0]),float(self.ll[key,0]),float(self.rr[key,0]))
+
+        return PipeArray(self.di[key,0],self.ll[key,0],self.rr[key,0])
+
+    @property
+    def diameter(self):
+        """Getter for the inner diameters."""
+        return self.di
+
+    @property
+    def diam(self):
+        """Getter for the inner diameters."""
+        return self.di
+
+    @property
+    def di(self):
+        """Getter for the inner diameters."""
+        return self._di/0.0254
+
+    @di.setter
+    def di(self,values):
+        """Setter for the inner diameters."""
+        self._di = np.ravel(values).astype(float).reshape((-1,1))*0.0254
+
+    @property
+    def length(self):
+        """Getter for the pipe lengths."""
+        return self.ll
+
+    @property
+    def ll(self):
+        """Getter for the pipe lengths."""
+        return self._ll/0.3048
+
+    @ll.setter
+    def ll(self,values):
+        """Setter for the pipe lengths."""
+        self._ll = np.ravel(values).astype(float).reshape((-1,1))*0.3048
+
+    @property
+    def epd(self):
+        """Getter for the relative roughness."""
+        return self.rr
+
+    @property
+    def rr(self):
+        """Getter for the relative roughness."""
+        return self._rr
+
+    @rr.setter
+    def rr(self,values):
+        """Setter for the relative roughness."""
+        self._rr = np.ravel(values).astype(float).reshape((-1,1))
+
+    @property
+    def radius(self):
+        """Getter for the pipe radii, inches."""
+        return self._radius/0.0254
+
+    @property
+    def _radius(self):
+        """Returns the radii of the pipes in SI units."""
+        return self._di/2
+
+    @property
+    def circ(self):
+        """Getter for the pipe circumferences, ft."""
+        return self._circ/0.3048
+
+    @property
+    def _circ(self):
+        """Returns the inner circumferences of the pipes in SI units."""
+        return np.pi*self._di
+
+    @property
+    def surface(self):
+        """Getter for the pipe surface areas, ft2."""
+        return self._surface/0.3048**2
+
+    @property
+    def _surface(self):
+        """Returns the inner surface areas of the pipes (excluding ends) in SI units."""
+        return self._circ*self._ll
+
+    @property
+    def csa(self):
+        """Getter for the pipe cross-sectional-areas, ft2."""
+        return self._csa/0.3048**2
+
+    @property
+    def _csa(self):
+        """Returns the cross-sectional areas of the pipes in SI units."""
+        return np.pi*(self._di**2)/4
+
+    @property
+    def volume(self):
+        """Getter for the pipe volumes, ft3."""
+        return self._volume/0.3048**3
+
+    @property
+    def _volume(self):
+        """Returns the volumes of the pipes in SI units."""
+        return self._csa*self._ll
+
 if __name__ == "__main__":
 
     pipe = Pipe(1,5)
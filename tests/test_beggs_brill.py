@@ -0,0 +1,144 @@
+import itertools
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from nodepy import _beggs_brill as BB
+from nodepy._pvt import PVTCache, PVTTable
+from nodepy._traverse import stream, traverse, vlp
+
+class TestBeggsBrill(unittest.TestCase):
+
+    def test_pgrad_array(self):
+        """The array-native gradient equals the scalar one element-wise in all flow regimes."""
+        states = np.array(list(itertools.product(
+            [150.,400.,900.,1500.],     # pressure, psia
+            [100.,150.,200.],           # temperature, °F
+            [20.,100.,500.,2000.],      # oil rate, stb/d
+            [0.,50.,500.],              # water rate, stb/d
+            [375.,1500.],               # gas-oil ratio, scf/stb
+            [0.65],[30.],[1.07],[2.44],
+            [90.,45.,0.,-30.],          # inclination, degrees
+            ))).T
+
+        scalar = np.array([BB.Pgrad(*state) for state in states.T])
+
+        np.testing.assert_allclose(BB.Pgrad_array(*states),scalar,rtol=1e-12)
+
+    def test_flow_regime_array(self):
+        """The masked regime selection reproduces the scalar branching."""
+        laml = np.array([0.005,0.005,0.2,0.2,0.2,0.2,0.6,0.6,0.6])
+        Nfr = np.array([1.,500.,1e-4,0.5,10.,500.,1e-3,5.,1e4])
+
+        L1 = 316*laml**0.302
+        L2 = 0.0009252*laml**-2.4684
+        L3 = 0.1*laml**-1.4516
+        L4 = 0.5*laml**-6.738
+
+        scalar = [BB.Flow_regime(*args) for args in zip(Nfr,laml,L1,L2,L3,L4)]
+
+        np.testing.assert_array_equal(BB.Flow_regime_array(Nfr,laml,L1,L2,L3,L4),scalar)
+
+    def test_pvt_cache(self):
+        """Cached properties on an on-grid point give the live gradient and count hits and misses."""
+        pvt = PVTCache(dP=0.5,dT=0.5)
+
+        state = (900.,150.,500.,50.,375.,0.65,30.,1.07,2.44,90.)
+
+        self.assertAlmostEqual(BB.Pgrad(*state,pvt=pvt),BB.Pgrad(*state),places=12)
+        self.assertAlmostEqual(BB.Pgrad(*state,pvt=pvt),BB.Pgrad(*state),places=12)
+
+        self.assertEqual((pvt.hits,pvt.misses),(1,1))
+
+    def test_pvt_cache_array(self):
+        """Array states look every element up in the cache and match the scalar gradient."""
+        pvt = PVTCache(dP=0.5,dT=0.5)
+
+        P = np.array([[400.,900.,1500.],[400.,900.,2000.5]])
+
+        args = (P,150.,500.,50.,375.,0.65,30.,1.07,2.44,90.)
+
+        scalar = [BB.Pgrad(p,*args[1:],pvt=pvt) for p in P.ravel().tolist()]
+
+        np.testing.assert_allclose(BB.Pgrad_array(*args,pvt=pvt),np.reshape(scalar,P.shape),rtol=1e-12)
+
+        self.assertAlmostEqual(BB.Pgrad_array(900.,*args[1:],pvt=pvt),BB.Pgrad(900.,*args[1:]),places=12)
+
+        self.assertEqual(pvt.misses,4)
+
+    def test_pvt_table(self):
+        """Gradients from a saved and reloaded PVT table stay close to the live ones."""
+        P,T,oil_rate = np.meshgrid([150.,400.,900.,1500.,3000.],[100.,150.,200.],[20.,100.,500.,2000.])
+
+        args = (P,T,oil_rate,0.5*oil_rate,375.,0.65,30.,1.07,2.44,90.)
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,"pvt.npz")
+            PVTTable(0.65,30.,1.07,375.).save(path)
+            pvt = PVTTable.load(path)
+
+        np.testing.assert_allclose(BB.Pgrad_array(*args,pvt=pvt),BB.Pgrad_array(*args),rtol=2e-3)
+
+        with self.assertRaises(ValueError):
+            pvt.props(900.,150.,0.7,30.,1.07,375.)
+
+    def test_pwf_q_euler(self):
+        """The 60-step march lags one step and takes the temperature linear in depth."""
+        args = (150.,100.,1500.,500.,375.,0.65,30.,1.07,2.44,90.,5000.,150.)
+
+        dz,Tgrad = 5000./60,50./5000.
+
+        # the legacy march: the gradient of a step is applied on the next one
+        p = 150.
+        for i in range(2,61):
+            p += dz*BB.Pgrad(p,100.+Tgrad*dz*(i-1),*args[2:10])
+
+        self.assertAlmostEqual(BB.Pwf_q(*args),p,places=9)
+        self.assertAlmostEqual(BB.Pwf_q(*args),1548.6219522,places=6)
+
+    def test_pwf_q_rk45(self):
+        """The adaptive traverse converges to the fine fixed-step RK4 traverse and accounts its work."""
+        args = (150.,100.,1500.,500.,375.,0.65,30.,1.07,2.44,90.,5000.,150.)
+
+        _,press,_ = vlp(BB.Pgrad_array,*args,nSteps=2000,scheme="rk4")
+
+        self.assertAlmostEqual(BB.Pwf_q(*args,method="rk45",rtol=1e-9,atol=1e-8),press[-1],delta=0.02)
+        self.assertAlmostEqual(BB.Pwf_q(*args,method="rk45",rtol=1e-9,atol=1e-8),1586.845,delta=0.01)
+
+        profile = traverse(BB.Pgrad,*args)
+
+        self.assertEqual(profile.depth[-1],5000.)
+        self.assertTrue(np.all(np.diff(profile.depth)>0))
+        self.assertEqual(profile.size,profile.nsteps+1)
+        self.assertEqual(profile.nfev,1+6*(profile.nsteps+profile.nreject))
+
+    def test_stream(self):
+        """Streamed chunks rebuild the Euler traverse of vlp, stop early and reduce to the last point."""
+        args = (150.,100.,1500.,500.,375.,0.65,30.,1.07,2.44,90.,5000.,150.)
+
+        chunks = list(stream(BB.Pgrad,*args,nSteps=100,chunksize=32))
+
+        self.assertEqual([chunk.size for chunk in chunks],[32,32,32,5])
+
+        profile = np.concatenate(chunks)
+
+        depth,press,temp = vlp(BB.Pgrad_array,*args,nSteps=100)
+
+        np.testing.assert_allclose(profile["press"],press,rtol=1e-12)
+        np.testing.assert_allclose(profile["temp"],temp,rtol=1e-12)
+
+        last, = stream(BB.Pgrad,*args,nSteps=100,final=True)
+
+        self.assertEqual(last.size,1)
+        self.assertEqual(last[0],profile[-1])
+
+        partial = np.concatenate(list(stream(BB.Pgrad,*args,nSteps=100,until=lambda z,p,T: p>1000.)))
+
+        self.assertGreater(partial["press"][-1],1000.)
+        self.assertTrue(np.all(partial["press"][:-1]<=1000.))
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy.pressure_drop import Compressible, Pipe
+
+class TestCompressible(unittest.TestCase):
+
+    def setUp(self):
+
+        self.flow = Compressible(Pipe(12.,10_000/0.3048,1e-4),Fluid(1.03e-2,rho=1.),temperature=293.15,molarweight=0.016)
+
+        self.P1 = 200*6894.76
+
+    def test_round_trip(self):
+        """The downstream pressures of the mass flows of get are the pressures they came from."""
+        fLD = self.flow.friction_mass(10.)*self.flow.pipe._ll/self.flow.pipe._di
+
+        P2 = np.linspace(self.flow.critical(fLD)*self.P1,self.P1,12)[1:-1]
+
+        G = self.flow.get(P2,self.P1,fD=self.flow.friction_mass(10.))
+
+        np.testing.assert_allclose(self.flow.downstream(G,self.P1,fD=self.flow.friction_mass(10.)),P2,atol=1e-3)
+
+        #with the friction of the mass flow both ways
+        G = self.flow.get(P2,self.P1)
+
+        np.testing.assert_allclose(self.flow.downstream(G,self.P1),P2,rtol=1e-9)
+
+    def test_fixed_point(self):
+        """Without fD the mass flows carry the friction factor of their own Reynolds number, also
+        where they are choked."""
+        P2 = np.linspace(0.,0.999,200)*self.P1
+
+        G = self.flow.get(P2,self.P1)
+
+        np.testing.assert_allclose(self.flow.get(P2,self.P1,fD=self.flow.friction_mass(G)),G,rtol=1e-9)
+
+        fLD = self.flow.friction_mass(G)*self.flow.pipe._ll/self.flow.pipe._di
+
+        self.assertTrue(np.any(P2<self.flow.critical(fLD)*self.P1))
+
+    def test_critical(self):
+        """The critical ratios solve fD*L/D = 1/w**2-ln(1/w**2)-1, one by one and all together."""
+        for fLD in (np.logspace(-3,4,50),np.logspace(-3,4,1000)):
+
+            x = 1/self.flow.critical(fLD)**2
+
+            np.testing.assert_allclose(x-np.log(x)-1,fLD,rtol=1e-10)
+
+        self.assertEqual(self.flow.critical(0.),1.)
+
+    def test_choked(self):
+        """Downstream pressures below the critical one give the choked mass flow."""
+        fD = 0.01
+
+        Pc = self.flow.critical(fD*self.flow.pipe._ll/self.flow.pipe._di)*self.P1
+
+        G = self.flow.get(np.array([1e3,0.5*Pc,Pc]),self.P1,fD=fD)
+
+        np.testing.assert_allclose(G,G[-1],rtol=1e-12)
+
+        self.assertTrue(np.isnan(self.flow.downstream(1.01*G[-1],self.P1,fD=fD)))
+
+    def test_incompressible_limit(self):
+        """A small pressure drop gives the mass flow of the Darcy-Weisbach equation at the inlet density."""
+        fD, dP = 0.015, np.array([1.,10.,100.])
+
+        P1 = 5e6
+
+        rho = P1*self.flow.molarweight/(self.flow.UGC*self.flow.temperature)
+
+        expected = self.flow.csa*np.sqrt(2*rho*dP*self.flow.pipe._di/(fD*self.flow.pipe._ll))
+
+        np.testing.assert_allclose(self.flow.get(P1-dP,P1,fD=fD),expected,rtol=1e-5)
+
+if __name__ == "__main__":
+
+    unittest.main()
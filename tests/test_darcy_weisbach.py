@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from scipy.optimize import brentq
+
+from nodepy.pressure_drop import DarcyWeisbach
+
+class TestDarcyWeisbach(unittest.TestCase):
+
+    def test_colebrook_newton(self):
+        """The vectorized Newton solution matches a bracketed solve of the Colebrook equation."""
+        Re,epd = np.meshgrid(np.logspace(3.7,8,12),np.r_[0.,np.logspace(-6,-1.5,6)])
+
+        colebrook = lambda x,Re,epd: x+2*np.log10(epd/3.7+2.51*x/Re)
+
+        reference = [1/brentq(colebrook,0.1,100.,args=(R,e),xtol=1e-15,rtol=1e-15)**2 for R,e in zip(Re.ravel(),epd.ravel())]
+
+        np.testing.assert_allclose(DarcyWeisbach.colebrook_newton(Re,epd).ravel(),reference,rtol=1e-13)
+
+    def test_colebrook_newton_chunks(self):
+        """Chunks with converged, slow and NaN elements give the results of a single chunk."""
+        Re = np.logspace(3.7,8,101)
+        Re[[3,50,97]] = np.nan
+
+        expected = DarcyWeisbach.colebrook_newton(Re,1e-4)
+
+        out = np.empty(Re.shape)
+
+        result = DarcyWeisbach.colebrook_newton(Re,1e-4,out=out,chunk=16)
+
+        self.assertTrue(np.shares_memory(result,out))
+
+        np.testing.assert_array_equal(np.isnan(result),np.isnan(Re))
+        np.testing.assert_allclose(result,expected,rtol=1e-14)
+
+if __name__ == "__main__":
+
+    unittest.main()
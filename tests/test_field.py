@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from nodepy import _field
+from nodepy._inflow import IPR
+
+class TestField(unittest.TestCase):
+
+    def setUp(self):
+
+        self.wells = np.zeros(6,dtype=_field.WELL_DTYPE)
+
+        for name,value in dict(Pb=2000.,FWHT=100.,GOR=375.,GasGrav=0.65,API=30.,WaterGrav=1.07,ID=2.44,Angle=90.,FBHT=180.).items():
+            self.wells[name] = value
+
+        self.wells["FWHP"] = [150.,150.,1500.,150.,200.,150.]
+        self.wells["Pres"] = [3000.,3500.,2500.,3000.,2500.,4000.]
+        self.wells["J"] = [1.,2.,1.,-1.,1.5,0.8]
+        self.wells["Wcut"] = [0.,0.3,0.5,0.2,0.1,0.6]
+        self.wells["Depth"] = [5000.,6000.,8000.,5000.,4000.,7000.]
+
+    def test_pool_matches_serial(self):
+        """The pooled run returns the serial records in well order and captures the failing well."""
+        serial,errors = _field.field(self.wells,max_workers=1)
+        pooled,_ = _field.field(self.wells,max_workers=2,chunksize=1)
+
+        np.testing.assert_array_equal(pooled["status"],serial["status"])
+        np.testing.assert_allclose(pooled["rate"],serial["rate"],equal_nan=True)
+
+        self.assertEqual(list(errors),[3])
+        self.assertEqual(serial["status"][3],_field.FAILED)
+        self.assertEqual(serial["status"][2],_field.NO_FLOW)
+
+        ok = serial["status"]==_field.OK
+
+        for well,result in zip(self.wells[ok],serial[ok]):
+            self.assertAlmostEqual(float(IPR().partial(well["Pb"],well["Pres"],rate=result["rate"],PI=well["J"])),result["pwf"],places=6)
+
+if __name__ == "__main__":
+
+    unittest.main()
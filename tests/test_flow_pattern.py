@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from nodepy._flow_pattern import FlowPatternMap, beggs_brill_regime, griffith_regime
+
+class TestFlowPattern(unittest.TestCase):
+
+    def test_lookup(self):
+        """Raster lookups with the boundary fallback agree with the exact regimes inside and outside the grid."""
+        rng = np.random.default_rng(0)
+
+        usl = 10**rng.uniform(-3.5,2.5,100_000)
+        usg = 10**rng.uniform(-3.5,3.5,100_000)
+
+        for pattern,regime in (("beggs_brill",beggs_brill_regime),("hagedorn_brown",griffith_regime)):
+
+            fpm = FlowPatternMap(2.44,pattern,shape=(128,128))
+
+            np.testing.assert_array_equal(fpm(usl,usg),regime(usl,usg,2.44))
+
+            self.assertGreater(fpm.coverage,0.9)
+
+    def test_pipe(self):
+        """The regimes of another pipe I.D. are refused instead of being looked up."""
+        fpm = FlowPatternMap(2.44,shape=(64,64))
+
+        np.testing.assert_array_equal(fpm([0.1,1.],[1.,10.],d=2.44),beggs_brill_regime([0.1,1.],[1.,10.],2.44))
+
+        with self.assertRaises(ValueError):
+            fpm([0.1,1.],[1.,10.],d=np.array([2.44,2.992]))
+
+if __name__ == "__main__":
+
+    unittest.main()
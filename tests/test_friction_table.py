@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from nodepy.pressure_drop import DarcyWeisbach, FrictionTable
+
+class TestFrictionTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.TemporaryDirectory()
+        cls.table = FrictionTable(os.path.join(cls.folder.name,"friction.npy"))
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.table
+        cls.folder.cleanup()
+
+    def test_error_bound(self):
+        """Interpolated friction factors stay within 2e-4 of the Colebrook ones over the grid."""
+        rng = np.random.default_rng(0)
+
+        Re = 10**rng.uniform(3,8,200_000)
+        epd = 10**rng.uniform(-10,-1,200_000)
+
+        error = np.abs(self.table(Re,epd)/DarcyWeisbach.colebrook_newton(Re,epd)-1)
+
+        self.assertLess(error.max(),2e-4)
+
+    def test_fallback(self):
+        """Scalar and array queries below or above the grid fall back to the Colebrook solution."""
+        self.assertEqual(self.table(2e8,0.2),DarcyWeisbach.colebrook_newton(2e8,0.2))
+        self.assertEqual(self.table(500.,1e-4),DarcyWeisbach.colebrook_newton(500.,1e-4))
+
+        Re,epd = np.array([2e8,1e5,500.,np.nan,5e5]),np.array([1e-3,0.2,1e-3,1e-4,1e-4])
+
+        fD = self.table(Re,epd)
+
+        np.testing.assert_array_equal(fD[:4],DarcyWeisbach.colebrook_newton(Re[:4],epd[:4]))
+        self.assertTrue(np.isnan(fD[3]))
+        self.assertLess(abs(fD[4]/DarcyWeisbach.colebrook_newton(5e5,1e-4)-1),2e-4)
+
+if __name__ == "__main__":
+
+    unittest.main()
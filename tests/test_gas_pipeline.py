@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy.pressure_drop import Compressible, GasPipeline, Pipe, PipeArray
+
+class IdealGasPipeline(GasPipeline):
+    """Gas pipeline of an ideal gas, Z = 1, with a constant viscosity."""
+
+    def density(self,P,T):
+        return P*(0.028964*self.gas_grav)/(self.UGC*T), np.ones(np.shape(P))
+
+    def viscosity(self,P,T,Z):
+        return np.full(np.shape(P),1.1e-5)
+
+class TestGasPipeline(unittest.TestCase):
+
+    def test_isothermal_limit(self):
+        """Without heat exchange the ideal gas march gives the outlet pressures of Compressible."""
+        pipe = Pipe(12.,30_000/0.3048,1e-4)
+
+        line = IdealGasPipeline(pipe,0.6)
+
+        flow = Compressible(pipe,Fluid(1.1e-2,rho=1.),temperature=300.,molarweight=0.028964*0.6)
+
+        G, P1 = np.array([5.,10.,20.,30.]), 60e5
+
+        outlet = line.march(G,P1,300.,rtol=1e-10,atol=(1e-4,1e-8))
+
+        np.testing.assert_allclose(outlet.temp,300.,rtol=1e-12)
+
+        np.testing.assert_allclose(outlet.press,flow.downstream(G,P1,xtol=1e-6),rtol=1e-8)
+
+        np.testing.assert_allclose(flow.get(outlet.press,P1),G,rtol=1e-8)
+
+    def test_lines(self):
+        """A PipeArray marches every line as its own scalar pipe."""
+        pipes = PipeArray(di=[8.,12.,16.],ll=[20_000/0.3048,30_000/0.3048,50_000/0.3048],rr=1e-4)
+
+        outlet = GasPipeline(pipes,0.65,U=2.,Tamb=283.15).march(10.,50e5,320.)
+
+        for i,(di,ll) in enumerate(((8.,20_000/0.3048),(12.,30_000/0.3048),(16.,50_000/0.3048))):
+
+            single = GasPipeline(Pipe(di,ll,1e-4),0.65,U=2.,Tamb=283.15).march(10.,50e5,320.)
+
+            np.testing.assert_allclose(outlet.press[i],single.press[0],rtol=1e-12)
+            np.testing.assert_allclose(outlet.temp[i],single.temp[0],rtol=1e-12)
+
+        self.assertTrue(np.all(np.diff(outlet.press)>0))
+
+    def test_choked_lines(self):
+        """Choked lines are flagged with NaN outlets while the others keep their results."""
+        line = GasPipeline(Pipe(12.,100_000/0.3048,1e-4),0.65)
+
+        G = np.array([5.,10.,30.,15.,40.])
+
+        with self.assertLogs(level="WARNING"):
+            outlet = line.march(G,50e5,300.)
+
+        np.testing.assert_array_equal(outlet.choked,[False,False,True,False,True])
+
+        self.assertTrue(np.all(np.isnan(outlet.press[outlet.choked])))
+        self.assertTrue(np.all(np.isnan(outlet.temp[outlet.choked])))
+
+        for rate,press in zip(G[~outlet.choked],outlet.press[~outlet.choked]):
+            np.testing.assert_allclose(press,line.get(rate,50e5,300.)[0],rtol=1e-12)
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,54 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from nodepy import _hagedorn_brown as HB
+from nodepy._pvt import PVTCache
+
+class TestHagedornBrown(unittest.TestCase):
+
+    def test_pgrad_array(self):
+        """The array-native gradient equals the scalar one element-wise."""
+        states = np.array(list(itertools.product(
+            [150.,400.,900.,1500.],     # pressure, psia
+            [100.,150.,200.],           # temperature, °F
+            [20.,100.,500.,2000.],      # oil rate, stb/d
+            [0.,50.,500.],              # water rate, stb/d
+            [375.,1500.],               # gas-oil ratio, scf/stb
+            [0.65],[30.],[1.07],[2.44],
+            [90.,45.,0.,-30.],          # inclination, degrees
+            ))).T
+
+        scalar = np.array([HB.Pgrad(*state) for state in states.T])
+
+        np.testing.assert_allclose(HB.Pgrad_array(*states),scalar,rtol=1e-12)
+
+        _,regime,holdup = HB.Pgrad_array(*states,full_output=True)
+
+        self.assertTrue(np.all((holdup>0)&(holdup<=1)))
+
+        #the Griffith bubble flow is reported as regime 1 by both versions
+        np.testing.assert_array_equal(regime,[HB.Pgrad(*state,full_output=True)[1] for state in states.T])
+
+        self.assertEqual(set(regime.tolist()),{0,1})
+
+    def test_pvt_cache_array(self):
+        """Array states look every element up in the cache and match the scalar gradient."""
+        pvt = PVTCache(dP=0.5,dT=0.5)
+
+        P = np.array([400.,900.,1500.,900.])
+
+        args = (P,150.,500.,50.,375.,0.65,30.,1.07,2.44,90.)
+
+        scalar = [HB.Pgrad(p,*args[1:],pvt=pvt) for p in P.tolist()]
+
+        np.testing.assert_allclose(HB.Pgrad_array(*args,pvt=pvt),scalar,rtol=1e-12)
+
+        self.assertAlmostEqual(HB.Pgrad_array(np.array(900.),*args[1:],pvt=pvt),HB.Pgrad(900.,*args[1:]),places=12)
+
+        self.assertEqual((pvt.hits,pvt.misses),(6,3))
+
+if __name__ == "__main__":
+
+    unittest.main()
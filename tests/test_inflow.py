@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from nodepy._inflow import IPR, IPRArray, Vogel_DarcyIPR
+
+class TestInflow(unittest.TestCase):
+
+    def setUp(self):
+
+        self.wells = dict(
+            poro = [0.19,0.22,0.15],
+            perm = [8.2,25.,3.],
+            height = [53.,20.,110.],
+            Bo = 1.1,
+            muo = [1.7,0.9,3.2],
+            ct = 1.29e-5,
+            re = 2980.,
+            rw = 0.328,
+            skin = [0.,2.,-1.5],
+            )
+
+        self.pres = np.array([5651.,4200.,3500.])
+        self.pb = np.array([3000.,4500.,2000.])
+
+    def test_partial(self):
+        """The (wells x pressures) matrix of IPRArray equals the scalar IPR of every well."""
+        pwf = np.linspace(0.,5651.,30)
+
+        inflow = IPRArray(**self.wells)
+
+        for model,n in (("vogel",None),("fetkovich",np.array([1.,0.8,1.2]))):
+
+            rates = inflow.partial(self.pb,self.pres,pwf,model=model,n=n)
+
+            self.assertEqual(rates.shape,(3,30))
+
+            for i in range(3):
+
+                well = IPR(**{key:np.ravel(value)[i] if np.size(value)>1 else value for key,value in self.wells.items()})
+
+                np.testing.assert_allclose(rates[i],well.partial(self.pb[i],self.pres[i],pwf,model=model,n=None if n is None else n[i]),equal_nan=True)
+
+    def test_partial_inverse(self):
+        """The flowing pressures of the rates of the composite IPR return the original pressures."""
+        pwf = np.linspace(0.,5651.,30)
+
+        inflow = IPRArray(**self.wells)
+
+        for model,n in (("vogel",None),("fetkovich",np.array([1.,0.8,1.2]))):
+
+            pres = np.minimum(pwf,self.pres[:,None])
+
+            rates = inflow.partial(self.pb,self.pres,pres,model=model,n=n)
+
+            np.testing.assert_allclose(inflow.partial(self.pb,self.pres,model=model,n=n,rate=rates),pres,atol=1e-3)
+
+        AOF = IPR().partial(2000.,3000.,0.,PI=1.5)
+
+        self.assertAlmostEqual(AOF,1.5*1000.+1.5*2000./1.8,places=9)
+        self.assertTrue(np.isnan(IPR().partial(2000.,3000.,rate=1.01*AOF,PI=1.5)))
+
+    def test_vogel_darcy(self):
+        """The loop-free legacy curve matches the point-by-point Darcy-Vogel rates."""
+        Q,Pwf = Vogel_DarcyIPR(self.pres,8.2,53.,1.7,2980.,0.328,0.,1.1,150.,self.pb,20)
+
+        J = (8.2*53./1.7)/(141.2*1.1*1.7*(np.log(2980./0.328)-0.75))
+
+        for i,(P,Pb) in enumerate(zip(self.pres,self.pb)):
+            for Pwfs,rate in zip(Pwf[i],Q[i]):
+                expected = J*(P-Pwfs) if Pwfs>=Pb else J*(P-Pb)+(J*Pb/1.8)*(1-0.2*(Pwfs/Pb)-0.8*(Pwfs/Pb)**2)
+                self.assertAlmostEqual(rate,expected,places=9)
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Chisholm, LockhartMartinelli, Pipe
+
+from nodepy.pressure_drop import DarcyWeisbach
+
+class TestLockhartMartinelli(unittest.TestCase):
+
+    def test_get_C(self):
+        """C is selected per element and is NaN where a phase is in the transition zone."""
+        lamG = np.array([True,True,False,False,False])
+        turbG = np.array([False,False,True,True,False])
+        lamL = np.array([True,False,True,False,True])
+        turbL = np.array([False,True,False,True,False])
+
+        np.testing.assert_array_equal(Chisholm.get_C(lamG,turbG,lamL,turbL),[5.,10.,12.,20.,np.nan])
+
+    def test_multiplier(self):
+        """Pattern names and codes dispatch every element to its own curve."""
+        X = np.array([2.,1.,0.5,3.])
+
+        names = ["slug_flow","annular_mist","dispersed_bubbly","bogus"]
+
+        expected = [LockhartMartinelli.slug_flow(2.),LockhartMartinelli.annular_mist(1.),LockhartMartinelli.dispersed_bubbly(0.5),np.nan]
+
+        np.testing.assert_allclose(LockhartMartinelli.multiplier(X,names),expected)
+        np.testing.assert_allclose(LockhartMartinelli.multiplier(X,[4,5,0,-1]),expected)
+
+    def test_multiplier_range(self):
+        """The slug flow line gives NaN below X = exp(-2.2/6.5) instead of negative multipliers."""
+        np.testing.assert_allclose(LockhartMartinelli.multiplier([0.5,0.7,1.],"slug_flow"),[np.nan,np.nan,2.2])
+
+    def test_drop_map(self):
+        """A map of laminar, transition and turbulent rate pairs matches the scalar calls and is
+        NaN where a phase is in the transition zone."""
+        args = (Pipe(4,100,1e-4),Fluid(0.02,rho=50.),Fluid(1.,rho=900.))
+
+        chisholm, martinelli = Chisholm(*args), LockhartMartinelli(*args)
+
+        grate, lrate = np.array([[1e-4],[1.6e-3],[1e-2]]), np.array([1e-3,5e-3,5e-2])
+
+        drops = chisholm.get(grate,lrate)
+
+        ReG, ReL = chisholm.gas.reynolds(grate), chisholm.liq.reynolds(lrate)
+
+        transition = lambda Re: (Re>=DarcyWeisbach.LOWER_REYNOLDS_LIMIT)&(Re<=DarcyWeisbach.UPPER_REYNOLDS_LIMIT)
+
+        np.testing.assert_array_equal(transition(ReG)|transition(ReL),[[False,True,False],[True,True,True],[False,True,False]])
+
+        np.testing.assert_array_equal(np.isnan(drops),transition(ReG)|transition(ReL))
+
+        patterns = np.array([[0,4,5]])
+
+        maps = martinelli.get(grate,lrate,patterns)
+
+        for i,j in np.ndindex(drops.shape):
+
+            np.testing.assert_allclose(drops[i,j],chisholm.get(grate[i,0],lrate[j])[0],rtol=1e-12)
+
+            np.testing.assert_allclose(maps[i,j],martinelli.get(grate[i,0],lrate[j],patterns[0,j])[0],rtol=1e-12)
+
+        self.assertTrue(np.all(np.isfinite(drops[[0,0,2,2],[0,2,0,2]])))
+
+if __name__ == "__main__":
+
+    unittest.main()
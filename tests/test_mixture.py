@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import Mixture, Pipe
+from nodepy._mixture import MixtureArrays
+from nodepy.pressure_drop import DarcyWeisbach
+
+class TestMixture(unittest.TestCase):
+
+    def setUp(self):
+
+        self.mixture = Mixture(Pipe(4,100,1e-4),Fluid(0.02,rho=50.),Fluid(1.,rho=900.))
+
+    def test_evaluate(self):
+        """The array path gives the head loss of get and fills a reused out argument in place."""
+        grate,lrate = np.logspace(-4,0,51),np.linspace(1e-4,0.05,51)
+
+        out = self.mixture.evaluate(grate,lrate,1.2)
+
+        self.assertIsInstance(out,MixtureArrays)
+        self.assertTrue(all(value.flags.c_contiguous for value in out))
+
+        np.testing.assert_allclose(out.head,self.mixture.get(grate,lrate,1.2,method="colebrook_newton"),rtol=1e-12)
+
+        again = self.mixture.evaluate(2*grate,lrate,1.2,out=out)
+
+        self.assertIs(again,out)
+        np.testing.assert_allclose(out.head,self.mixture.get(2*grate,lrate,1.2,method="colebrook_newton"),rtol=1e-12)
+
+        with self.assertRaises(ValueError):
+            self.mixture.evaluate(grate[:-1],lrate[:-1],out=out)
+
+    def test_regimes(self):
+        """Laminar, transition and turbulent states and other friction methods match get."""
+        lrate = np.logspace(-7,-1,40)
+
+        for method in ("colebrook_newton","haaland"):
+
+            out = self.mixture.evaluate(1e-6,lrate,method=method)
+
+            expected = self.mixture.get(1e-6,lrate,method=method)
+
+            np.testing.assert_allclose(out.head,expected,rtol=1e-12,equal_nan=True)
+
+        Re = 4*out.rho*out.rate/(np.pi*out.visc*self.mixture.pipe.diam)
+
+        transition = (Re>=DarcyWeisbach.LOWER_REYNOLDS_LIMIT)&(Re<=DarcyWeisbach.UPPER_REYNOLDS_LIMIT)
+
+        self.assertTrue(np.any(Re<DarcyWeisbach.LOWER_REYNOLDS_LIMIT) and np.any(transition) and np.any(Re>DarcyWeisbach.UPPER_REYNOLDS_LIMIT))
+        np.testing.assert_array_equal(np.isnan(out.head),transition)
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy import DarcyWeisbach, HazenWilliams, Pipe, PipeArray
+from nodepy.network import Network
+
+class TestNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.water = Fluid(1.,rho=1000.)
+
+    def test_symmetric_loop(self):
+        """Two identical branches with a cross pipe split the demand evenly with no cross flow."""
+        network = Network()
+
+        network.add_node("S",head=100.)
+        network.add_node("A")
+        network.add_node("B")
+        network.add_node("J",demand=0.02)
+
+        pipes = PipeArray([6.,6.,6.,6.,4.],[300.,300.,300.,300.,200.])
+
+        model = HazenWilliams(pipes,self.water)
+
+        network.add_edges(["S","S","A","B","A"],["A","B","J","J","B"],model)
+
+        solver = network.solve(tol=1e-10)
+
+        # h = K*Q**1.852 with K of the 6 in. pipes, each branch carrying half of the demand
+        K = HazenWilliams(Pipe(6.,300.),self.water).get(1.)
+
+        self.assertTrue(solver.converged)
+        np.testing.assert_allclose(solver.flows,[0.01,0.01,0.01,0.01,0.],atol=1e-8)
+        np.testing.assert_allclose(solver.heads,[100.,100.-K*0.01**1.852,100.-K*0.01**1.852,100.-2*K*0.01**1.852],rtol=1e-9)
+
+    def test_balance(self):
+        """A looped Darcy-Weisbach network satisfies continuity and the head losses of its edges."""
+        network = Network()
+
+        network.add_node(0,head=50.)
+        network.add_node(1,head=45.)
+
+        for name,demand in zip(range(2,7),[2e-3,5e-3,1e-3,4e-3,3e-3]):
+            network.add_node(name,demand=demand)
+
+        sources,targets = [0,0,2,2,3,4,5,1,6],[2,3,3,4,5,5,6,6,3]
+
+        pipes = PipeArray([4.,6.,3.,4.,4.,3.,4.,6.,3.],[200.,300.,150.,250.,200.,100.,300.,150.,200.],1e-4)
+
+        network.add_edges(sources,targets,DarcyWeisbach(pipes,self.water),method="colebrook_newton")
+
+        solver = network.solve(tol=1e-12)
+
+        self.assertTrue(solver.converged)
+
+        np.testing.assert_allclose(solver.A21@solver.flows+solver.demand,0.,atol=1e-12)
+
+        h,_ = solver.headloss(solver.flows)
+
+        np.testing.assert_allclose(h,solver.heads[sources]-solver.heads[targets],rtol=1e-8,atol=1e-10)
+
+    def test_inexact_cg(self):
+        """Loose conjugate gradient solves converge on continuity, failed ones are reported."""
+        network = Network()
+
+        network.add_node(0,head=50.)
+
+        for name,demand in zip(range(1,4),[2e-3,5e-3,1e-3]):
+            network.add_node(name,demand=demand)
+
+        pipes = PipeArray([4.,6.,3.,4.],[200.,300.,150.,250.],1e-4)
+
+        network.add_edges([0,0,1,2],[1,2,2,3],DarcyWeisbach(pipes,self.water),method="colebrook_newton")
+
+        solver = network.solve(tol=1e-10,linsolve="cg",rtol=0.5)
+
+        self.assertTrue(solver.converged)
+
+        np.testing.assert_allclose(solver.A21@solver.flows+solver.demand,0.,atol=1e-10*np.sum(np.abs(solver.flows)))
+
+        with self.assertLogs(level="WARNING") as logs:
+            solver = network.solve(tol=1e-10,maxiter=3,linsolve="cg",rtol=0.,atol=0.)
+
+        self.assertFalse(solver.converged)
+        self.assertIn("Conjugate gradients stopped",logs.output[0])
+
+    def test_derivative(self):
+        """The analytical head loss derivative matches central finite differences in both regimes."""
+        model = DarcyWeisbach(PipeArray([2.,4.,8.],[100.,100.,100.],[1e-4,1e-3,0.]),self.water)
+
+        rates = np.array([1e-7,1e-6,1e-3,1e-2,1e-1])
+
+        for method in ("colebrook","colebrook_newton"):
+
+            dQ = 1e-6*rates
+
+            numerical = (model.get(rates+dQ,method=method)-model.get(rates-dQ,method=method))/(2*dQ)
+
+            np.testing.assert_allclose(model.derivative(rates,method=method),numerical,rtol=1e-6)
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,57 @@
+import math
+import unittest
+
+import numpy as np
+
+import psapy.FluidProps as FluidProps
+
+from nodepy import _hagedorn_brown as HB
+from nodepy._nodal import operating_points
+from nodepy._traverse import vlp
+
+class TestNodal(unittest.TestCase):
+
+    def test_stability(self):
+        """A U-shaped tubing curve crossing a straight-line IPR twice gives an unstable and a stable point."""
+        ipr = lambda q: 3000.-q
+        tpr = lambda q: 1500.+(q-1000.)**2/500.
+
+        points,nfev = operating_points(ipr,tpr,3000.,full_output=True)
+
+        rates = [750.-250.*math.sqrt(5.),750.+250.*math.sqrt(5.)]
+
+        np.testing.assert_allclose([point.rate for point in points],sorted(rates),rtol=1e-9)
+        self.assertEqual([point.stable for point in points],[False,True])
+        self.assertLess(nfev,60)
+
+    def test_legacy_intersection(self):
+        """The operating point of the _optimize.py well matches the 10,000-point resampling of the script."""
+        Pressure,Psat = 3000.,FluidProps.Pbub(150.,75.,100.,0.65,30.,375.)
+
+        J = (75.*75./1.55)/(141.2*1.21*1.55*(math.log(1053./0.328)-0.75-1.5))
+
+        pwf = Pressure-Pressure/20*np.arange(21)
+        rate = np.where(pwf>=Psat,J*(Pressure-pwf),J*(Pressure-Psat)+J*Psat/1.8*(1-0.2*pwf/Psat-0.8*(pwf/Psat)**2))
+        rate[0] = 0.1
+
+        _,press,_ = vlp(HB.Pgrad_array,150.,100.,rate,0.5*rate,375.,0.65,30.,1.07,2.44,90.,5000.,150.)
+
+        # the script: both curves resampled on 10,000 rates and scanned for sign changes
+        QNew = np.linspace(0.1,rate[-1],10000)
+        P_IPR = np.interp(QNew,rate,pwf)
+        P_VLP = np.interp(QNew,rate,press[:,-1])
+        idx = np.argwhere(np.diff(np.sign(P_IPR-P_VLP))!=0.0).reshape(-1)
+
+        points,nfev = operating_points(
+            lambda q: np.interp(q,rate,pwf),
+            lambda q: np.interp(q,rate,press[:,-1]),
+            rate[-1],qmin=0.1,full_output=True)
+
+        self.assertEqual(len(points),idx.size)
+        self.assertLess(abs(points[0].rate-QNew[idx[0]]),QNew[1]-QNew[0])
+        self.assertTrue(points[0].stable)
+        self.assertLess(nfev,60)
+
+if __name__ == "__main__":
+
+    unittest.main()
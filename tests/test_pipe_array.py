@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from respy import Fluid
+
+from nodepy.pressure_drop import DarcyWeisbach, HazenWilliams, Pipe, PipeArray
+
+class TestPipeArray(unittest.TestCase):
+
+    def setUp(self):
+        self.pipes = PipeArray([2.,4.,6.,8.],[100.,250.,500.,50.],[1e-4,0.,2e-3,5e-4])
+        self.water = Fluid(1.,rho=1000.)
+
+    def test_darcy_weisbach(self):
+        """A PipeArray of N pipes gives the heads and derivatives of N Pipe models."""
+        rates = np.array([1e-6,1e-4,1e-3,1e-2])
+
+        model = DarcyWeisbach(self.pipes,self.water)
+
+        heads = model.get(rates,method="colebrook_newton")
+        slopes = model.derivative(rates,method="colebrook_newton")
+
+        self.assertEqual(heads.shape,(4,4))
+
+        for index in range(len(self.pipes)):
+            single = DarcyWeisbach(self.pipes[index],self.water)
+            np.testing.assert_allclose(heads[index],single.get(rates,method="colebrook_newton"),rtol=1e-12)
+            np.testing.assert_allclose(slopes[index],single.derivative(rates,method="colebrook_newton"),rtol=1e-12)
+
+        paired = model.get(rates.reshape((-1,1)),method="colebrook_newton")
+
+        np.testing.assert_allclose(paired.ravel(),np.diag(heads),rtol=1e-12)
+
+    def test_hazen_williams(self):
+        """A PipeArray of N pipes gives the heads of N Pipe models."""
+        rates = np.array([1e-3,1e-2,5e-2])
+
+        heads = HazenWilliams(self.pipes,self.water).get(rates)
+
+        for index in range(len(self.pipes)):
+            np.testing.assert_allclose(heads[index],HazenWilliams(self.pipes[index],self.water).get(rates),rtol=1e-12)
+
+    def test_scalar_pipe(self):
+        """A scalar Pipe and rate give a one element head."""
+        self.assertEqual(DarcyWeisbach(Pipe(4.,100.,1e-4),self.water).get(1e-3).shape,(1,))
+
+if __name__ == "__main__":
+
+    unittest.main()
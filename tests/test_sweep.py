@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from nodepy import _beggs_brill as BB
+from nodepy import _sweep
+from nodepy._inflow import IPR
+from nodepy._nodal import operating_points
+from nodepy._traverse import vlp
+
+class TestSweep(unittest.TestCase):
+
+    fixed = dict(Pres=3000.,J=1.5,Pb=2000.,FWHT=100.,GasGrav=0.65,API=30.,WaterGrav=1.07,Angle=90.,Depth=6000.,FBHT=180.)
+
+    def test_operating_point(self):
+        """A sweep cell equals the largest stable point of the scalar operating point solver."""
+        result = _sweep.sweep(dict(FWHP=[100.,200.],GOR=[375.],Wcut=[0.3],ID=[2.441,2.992]),cache=False,**self.fixed)
+
+        tubing = lambda q: vlp(BB.Pgrad_array,200.,100.,q,q*0.3/0.7,375.,0.65,30.,1.07,2.441,90.,6000.,180.)[1][-1]
+
+        AOF = IPR().partial(2000.,3000.,0.,PI=1.5)
+
+        points = operating_points(lambda q: IPR().partial(2000.,3000.,rate=q,PI=1.5),tubing,AOF*(1-1e-9),qmin=1e-3*AOF,nGrid=31)
+
+        cell = result.sel(FWHP=200.,GOR=375.,Wcut=0.3,ID=2.441)
+
+        self.assertEqual(result["rate"].shape,(2,1,1,2))
+        self.assertAlmostEqual(cell["rate"],[point for point in points if point.stable][-1].rate,places=3)
+
+    def test_cache(self):
+        """Enlarging a cached grid only computes the new cells."""
+        computed = []
+
+        def spy(wells,*args):
+            computed.append(wells.size)
+            return operating(wells,*args)
+
+        operating,_sweep._operating = _sweep._operating,spy
+
+        try:
+            with tempfile.TemporaryDirectory() as folder:
+                axes = dict(FWHP=[100.,200.],GOR=[375.,800.],Wcut=[0.3],ID=[2.441])
+                small = _sweep.sweep(axes,cache=folder,**self.fixed)
+                large = _sweep.sweep(dict(axes,FWHP=[100.,200.,400.]),cache=folder,**self.fixed)
+        finally:
+            _sweep._operating = operating
+
+        self.assertEqual(computed,[4,2])
+        np.testing.assert_array_equal(large.values[:2],small.values)
+
+if __name__ == "__main__":
+
+    unittest.main()